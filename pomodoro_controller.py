@@ -0,0 +1,556 @@
+import logging
+import os
+import time
+import tkinter as tk
+from datetime import datetime
+from tkinter import messagebox
+
+from pomodoro_core import (METRICS, POMODORO, SHORT_BREAK, DataFileLocked, DesktopNotifier, ExportJob, PomodoroCycle,
+                           SoundPlayer, TaskTracker, date_range_for, report_range, retention_days_setting,
+                           setup_logging, stop_logging, write_summary)
+from pomodoro_core.startup import StartupProfile, exit_after_startup
+
+
+class PomodoroController:
+    """Timer, task and report behaviour shared by the two frontends.
+
+    A frontend subclasses this, lays the window out in create_widgets()
+    and styles it in setup_style(). create_widgets() must make the
+    widgets used here: timer_label, mode_label, start_button,
+    pause_button, project_combo, task_combo, date_var, loading_label,
+    loading_bar, sessions_pager, export_status_label and notifications.
+    """
+
+    # Initial window size, and the file name recorded in the startup profile
+    geometry = "700x550"
+    frontend = None
+
+    def __init__(self, root, profile=None):
+        self.root = root
+        self.profile = profile or StartupProfile()
+        self.root.title("Pomodoro Timer with Task Tracking")
+        self.root.geometry(self.geometry)
+        self.root.resizable(True, True)
+        
+        # Theme, fonts and colors are set up before any widget is made
+        self.setup_style()
+        
+        # Log records are written to pomodoro_app.log and the console on a background thread
+        setup_logging()
+        self.logger = logging.getLogger('pomodoro')
+        
+        self.logger.info("Application started")
+        
+        # Timer settings
+        self.cycle = PomodoroCycle(
+            pomodoro_time=25 * 60,  # 25 minutes in seconds
+            short_break_time=5 * 60,  # 5 minutes
+            long_break_time=15 * 60  # 15 minutes
+        )
+        self.tick_job = None
+        # When the pending tick is due, to measure how late it runs
+        self.tick_due = None
+        self.export_job = None
+        
+        # Sound settings
+        self.enable_sounds = tk.BooleanVar(value=True)
+        self.sound_player = SoundPlayer()
+        
+        # Notifications never block the event loop, the timer keeps running while they show
+        self.desktop_notifications = tk.BooleanVar(value=False)
+        self.desktop_notifier = DesktopNotifier()
+        
+        # Task tracking
+        self.data_file = "pomodoro_data.json"
+        self.tracker = TaskTracker(self.data_file, retention_days=retention_days_setting())
+        self.current_task = None
+        self.current_project = None
+        self.task_start_time = None
+        
+        # Only one program may write the data file at a time
+        try:
+            self.tracker.lock_data_file()
+        except DataFileLocked as e:
+            self.logger.error(str(e))
+            messagebox.showerror("Data File In Use", f"{e}.\n\nClose the other Pomodoro Timer and try again.")
+            stop_logging()
+            self.root.destroy()
+            raise SystemExit(1)
+        
+        # Projects and tasks come from the top of the data file, the sessions load later
+        self.tracker.load_header()
+        
+        # Create the interface
+        self.create_widgets()
+        self.update_timer_display()
+        self.profile.mark("widgets")
+        
+        # Make sure queued writes reach the disk when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Session history is loaded once the empty window is on screen
+        self.root.after_idle(self.on_first_paint)
+    
+    def setup_style(self):
+        """Set up the theme, fonts and colors; the default ttk look needs nothing"""
+    
+    def create_widgets(self):
+        raise NotImplementedError
+    
+    def on_first_paint(self):
+        self.profile.mark("first paint")
+        # Idle callbacks run after the pending redraws, go round the event loop once more
+        self.root.after(0, self.load_history)
+    
+    def load_history(self):
+        """Read the session history on a background thread and show it when it arrives"""
+        self.tracker.load_in_background()
+        self.show_loading(True)
+        self.poll_history()
+    
+    def poll_history(self):
+        try:
+            if not self.tracker.poll_loaded():
+                self.root.after(50, self.poll_history)
+                return
+        except Exception as e:
+            self.show_loading(False)
+            messagebox.showerror("Error", f"Could not load session history: {str(e)}")
+            self.on_close()
+            return
+        
+        self.show_loading(False)
+        self.project_combo['values'] = self.tracker.complete_projects('')
+        self.refresh_task_choices()
+        self.populate_sessions_tree()
+        
+        self.profile.mark("history")
+        self.logger.info(f"Startup: {self.profile.summary()}")
+        self.profile.record(self.frontend)
+        if exit_after_startup():
+            self.on_close()
+    
+    def show_loading(self, loading):
+        """Show or hide the indicator next to the date range while history loads"""
+        if loading:
+            self.loading_label.pack(side=tk.LEFT, padx=5)
+            self.loading_bar.pack(side=tk.LEFT, padx=5)
+            self.loading_bar.start(15)
+        else:
+            self.loading_bar.stop()
+            self.loading_bar.pack_forget()
+            self.loading_label.pack_forget()
+    
+    def on_close(self):
+        """Flush pending writes and stop background threads before closing"""
+        self.cancel_tick()
+        self.tracker.close()
+        self.sound_player.close()
+        self.desktop_notifier.close()
+        try:
+            METRICS.record()
+        except OSError as e:
+            self.logger.error(f"Could not write metrics: {str(e)}")
+        stop_logging()
+        self.root.destroy()
+    
+    def add_project(self, event=None):
+        project = self.project_combo.get().strip()
+        if self.tracker.add_project(project):
+            self.project_combo['values'] = self.tracker.complete_projects('')
+            self.refresh_task_choices()
+    
+    def delete_project(self):
+        project = self.project_combo.get()
+        if self.tracker.has_project(project):
+            if messagebox.askyesno("Confirm", (f"Delete project '{project}'? "
+                                               "This will remove all associated task records.")):
+                # Removes the project's tasks and sessions too
+                removed = self.tracker.delete_project(project)
+                
+                self.project_combo['values'] = self.tracker.complete_projects('')
+                self.project_combo.set('')
+                self.refresh_task_choices()
+                self.remove_sessions_from_tree(removed)
+    
+    def add_task(self, event=None):
+        project = self.project_combo.get()
+        task = self.task_combo.get().strip()
+        
+        if not project:
+            messagebox.showwarning("Warning", "Please select or add a project first.")
+            return
+        
+        if task:
+            if self.tracker.add_task(project, self.tracker.typed_task_name(task, project)):
+                # A project that was typed but never added comes with its first task
+                self.project_combo['values'] = self.tracker.complete_projects('')
+                self.refresh_task_choices()
+    
+    def delete_task(self):
+        task_id = self.tracker.find_task(self.task_combo.get(), self.project_combo.get())
+        if task_id is not None:
+            task_key = self.tracker.task_key(task_id)
+            if messagebox.askyesno("Confirm", f"Delete task '{task_key}'? This will remove all associated records."):
+                removed = self.tracker.delete_task(task_id)
+                
+                self.refresh_task_choices()
+                self.task_combo.set('')
+                self.remove_sessions_from_tree(removed)
+    
+    def refresh_task_choices(self, event=None):
+        """List only the selected project's tasks, or every task when no project is selected, most used first"""
+        self.task_combo['values'] = self.tracker.complete_tasks('', self.project_combo.get())
+    
+    def update_timer_display(self):
+        minutes, seconds = divmod(self.cycle.remaining(), 60)
+        time_string = f"{minutes:02d}:{seconds:02d}"
+        self.timer_label.config(text=time_string)
+        
+        # Update mode label
+        if self.cycle.mode == POMODORO:
+            pomodoro_count = self.cycle.completed_pomodoros
+            self.mode_label.config(text=f"Pomodoro Mode ({pomodoro_count}/{self.cycle.long_break_every})")
+        elif self.cycle.mode == SHORT_BREAK:
+            self.mode_label.config(text="Short Break")
+        else:
+            self.mode_label.config(text="Long Break")
+    
+    def start_timer(self):
+        if not self.cycle.running:
+            # Validate task and project selection for Pomodoro mode
+            if not self.cycle.on_break:
+                self.current_task = self.task_combo.get()
+                self.current_project = self.project_combo.get()
+                
+                if not self.current_project:
+                    messagebox.showwarning("Warning", "Please select a project before starting the timer.")
+                    return
+                    
+                if not self.current_task:
+                    messagebox.showwarning("Warning", "Please select a task before starting the timer.")
+                    return
+            
+            self.start_button.config(state=tk.DISABLED)
+            self.pause_button.config(state=tk.NORMAL)
+            
+            # If we're starting a Pomodoro, record the start time
+            if not self.cycle.on_break:
+                self.task_start_time = datetime.now()
+                print(f"Started session for {self.current_project}: {self.current_task} at {self.task_start_time}")
+            
+            self.cycle.start()
+            self.tick()
+    
+    def notify(self, title, message):
+        """Show a message in the window, and on the desktop if enabled, without waiting for the user"""
+        self.notifications.show(title, message)
+        if self.desktop_notifications.get():
+            self.desktop_notifier.notify(title, message)
+    
+    def play_sound(self, sound_type):
+        """Play a sound based on the type of notification"""
+        if not self.enable_sounds.get():
+            return
+        
+        # Playback happens on the sound player's thread, this never blocks
+        self.sound_player.play(sound_type)
+    
+    def tick(self):
+        """Refresh the countdown from the timer and handle completion"""
+        self.tick_job = None
+        if self.tick_due is not None:
+            METRICS.observe("tick_jitter", (time.monotonic() - self.tick_due) * 1000)
+            self.tick_due = None
+        if not self.cycle.running:
+            return
+        
+        if not self.cycle.expired():
+            self.update_timer_display()
+            # Wake up again just as the display would change
+            delay = self.cycle.ms_until_next_second()
+            self.tick_due = time.monotonic() + delay / 1000
+            self.tick_job = self.root.after(delay, self.tick)
+            return
+        
+        # Short or long break after a Pomodoro, a new Pomodoro after a break.
+        # The timer is stopped before any dialog can let Pause or Reset run.
+        finished = self.cycle.advance()
+        self.update_timer_display()
+        self.start_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED)
+        
+        # Actions when timer completes
+        if finished == POMODORO:
+            # Play completion sound
+            self.play_sound("pomodoro_complete")
+            
+            # Record task session when Pomodoro completes
+            if self.task_start_time and self.current_task:
+                print(f"Pomodoro completed for {self.current_project}: {self.current_task}")
+                self.record_task_session()
+            
+            # Reset task start time after completion
+            self.task_start_time = None
+            self.notify("Pomodoro Complete", "Time to take a break!")
+        else:
+            # Play break completion sound
+            self.play_sound("break_complete")
+            self.task_start_time = None
+            self.notify("Break Complete", "Time to focus!")
+    
+    def cancel_tick(self):
+        """Cancel the pending timer wakeup, if any"""
+        if self.tick_job is not None:
+            self.root.after_cancel(self.tick_job)
+            self.tick_job = None
+            self.tick_due = None
+    
+    def skip_break(self):
+        """Skip the current break and start a new Pomodoro session"""
+        # Only allow skipping during break modes
+        if not self.cycle.on_break:
+            return
+            
+        self.logger.info(f"Skipping {self.cycle.mode}")
+        
+        # Stop the current timer if it's running
+        self.cancel_tick()
+        
+        # Change to Pomodoro mode and reset timer
+        self.cycle.skip_break()
+        
+        # Update display and color scheme
+        self.update_timer_display()
+        self.start_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED)
+        
+        # Play a gentle notification sound
+        if self.enable_sounds.get():
+            try:
+                self.play_sound("skip_break")
+            except:
+                pass
+        
+        # Log the skip action
+        self.logger.info("Break skipped, ready for next Pomodoro")
+        self.notify("Break Skipped", "Break skipped. Ready to start next Pomodoro!")
+    
+    def pause_timer(self):
+        if self.cycle.running:
+            self.cancel_tick()
+            self.cycle.pause()
+            self.update_timer_display()
+            self.start_button.config(state=tk.NORMAL)
+            self.pause_button.config(state=tk.DISABLED)
+            
+            # If we're pausing a Pomodoro (not a break), record the session
+            if not self.cycle.on_break and self.task_start_time:
+                self.record_task_session()
+                # Reset task start time to prevent double-recording
+                self.task_start_time = None
+    
+    def reset_timer(self):
+        # If we're resetting a running Pomodoro, record the session
+        if self.cycle.running and not self.cycle.on_break and self.task_start_time:
+            self.record_task_session()
+        
+        self.cancel_tick()
+        
+        # Only reset the time based on the current mode
+        self.cycle.reset()
+        self.update_timer_display()
+        self.start_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED)
+        
+        # Reset task start time
+        self.task_start_time = None
+    
+    def record_task_session(self):
+        # Only record if we have a valid start time and task
+        if not self.task_start_time or not self.current_task or not self.current_project:
+            return
+            
+        with METRICS.timed("record_session"):
+            # Sessions shorter than a minute are not recorded
+            row = self.tracker.record_session(self.current_project, self.current_task,
+                                              self.task_start_time, datetime.now())
+            if row is None:
+                return
+            
+            # Update the sessions tree
+            self.add_session_to_tree(row)
+            # A task that was typed but never added has just been added
+            self.refresh_task_choices()
+        
+        # Display confirmation message
+        sessions = self.tracker.sessions
+        self.notify("Session Recorded",
+                    (f"Session recorded:\nProject: {self.current_project}\nTask: {sessions.task_name(row)}\n"
+                     f"Duration: {self.format_duration(sessions.duration[row])}"))
+    
+    def format_duration(self, seconds):
+        """Format duration in seconds to mm:ss format"""
+        minutes = int(seconds // 60)
+        seconds = int(seconds % 60)
+        return f"{minutes:02d}:{seconds:02d}"
+    
+    def format_session_row(self, row):
+        """Return the Treeview column values for a session row"""
+        sessions = self.tracker.sessions
+        start_time = sessions.start_datetime(row)
+        date_str = start_time.strftime("%Y-%m-%d")
+        time_str = start_time.strftime("%H:%M")
+        duration = self.format_duration(sessions.duration[row])
+        return (date_str, time_str, sessions.project_name(row), sessions.task_name(row), duration)
+    
+    def populate_sessions_tree(self):
+        """Populate the sessions tree with filtered sessions based on selected date range"""
+        # Determine date range based on selection
+        date_filter = self.date_var.get()
+        start_date, end_date = date_range_for(date_filter, datetime.now().date())
+        self.view_range = (start_date, end_date)
+        
+        # poll_history() fills the view in once the history has loaded
+        if self.tracker.loading:
+            return
+        
+        with METRICS.timed("populate_sessions_tree"):
+            # Look up the date range in the index, most recent first
+            filtered_sessions = self.tracker.rows_between(start_date, end_date, newest_first=True)
+            
+            # Show the sessions one page at a time
+            self.sessions_pager.set_rows(filtered_sessions)
+            self.update_session_stats()
+        
+        # Update the label to show count
+        count = len(filtered_sessions)
+        range_text = date_filter
+        if count == 0:
+            self.logger.debug(f"No sessions found for {range_text}")
+        else:
+            self.logger.debug(f"Showing {count} sessions for {range_text}")
+    
+    def update_session_stats(self):
+        """Refresh any totals the frontend shows for the current view"""
+    
+    def add_session_to_tree(self, row):
+        """Insert a newly recorded session into the view if it falls in the selected range"""
+        start_date, end_date = self.view_range
+        session_date = self.tracker.sessions.start_datetime(row).date()
+        if start_date is not None and session_date < start_date:
+            return
+        if end_date is not None and session_date > end_date:
+            return
+        
+        self.sessions_pager.insert_row(row)
+        self.update_session_stats()
+    
+    def remove_sessions_from_tree(self, rows):
+        """Remove deleted sessions from the view without rebuilding it"""
+        if self.sessions_pager.remove_rows(rows):
+            self.update_session_stats()
+    
+    def export_daily_report(self):
+        self.export_report(*report_range("daily", datetime.now().date()), "daily")
+    
+    def export_weekly_report(self):
+        self.export_report(*report_range("weekly", datetime.now().date()), "weekly")
+    
+    def export_all_time_report(self):
+        self.export_report(*report_range("all_time", datetime.now().date()), "all_time")
+    
+    def export_summary_report(self):
+        """Export totals and per-project, per-task and per-day breakdowns for the selected date range"""
+        start_date, end_date = self.view_range
+        if not self.tracker.totals(start_date, end_date)[1]:
+            messagebox.showinfo("No Data", "No task sessions found for the selected period.")
+            return
+        
+        # The file extension picks the format
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile=f"pomodoro_summary_{start_date or 'all_time'}.csv"
+        )
+        
+        if not filename:
+            return
+        
+        try:
+            with METRICS.timed("export_summary"):
+                summary = self.tracker.summary(start_date, end_date)
+                write_summary(summary, filename)
+        except OSError as e:
+            self.logger.error(f"Error exporting summary: {str(e)}")
+            messagebox.showerror("Error", f"Could not export summary: {str(e)}")
+            return
+        
+        self.notify("Report Exported", f"The summary report has been exported to {filename}")
+        self.logger.info(f"Exported summary of {summary['session_count']} sessions to {filename}")
+    
+    def view_data_file(self):
+        """Open the JSON data file in the default text editor, or the folder holding a database"""
+        try:
+            # Fold pending changes in so the file shows everything
+            self.tracker.sync()
+            
+            # Check if file exists first
+            if not os.path.exists(self.tracker.data_file):
+                messagebox.showinfo("File Not Found", "The data file has not been created yet.")
+                return
+            
+            # A SQLite database is not something a text editor can show
+            path = self.tracker.data_file
+            if self.tracker.store.supports_queries:
+                path = os.path.dirname(os.path.abspath(path))
+            
+            # Open the JSON file in the default application
+            import webbrowser
+            webbrowser.open(path)
+            self.logger.info(f"Opened data file for viewing: {path}")
+        except Exception as e:
+            self.logger.error(f"Error opening data file: {str(e)}")
+            messagebox.showerror("Error", f"Could not open data file: {str(e)}")
+    
+    def export_report(self, start_date, end_date, report_type):
+        if self.export_job is not None:
+            messagebox.showinfo("Export Running", "Please wait for the current export to finish.")
+            return
+        
+        total = self.tracker.count_sessions(start_date, end_date)
+        if not total:
+            messagebox.showinfo("No Data", f"No task sessions found for the {report_type} report period.")
+            return
+        
+        # Ask for save location
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile=f"pomodoro_{report_type}_report_{start_date or datetime.now().date()}.csv"
+        )
+        
+        if not filename:
+            return
+        
+        # Stream the rows to disk on a worker thread and poll it for progress
+        self.export_job = ExportJob(self.tracker.iter_sessions(start_date, end_date), filename, total).start()
+        self.poll_export(report_type)
+    
+    def poll_export(self, report_type):
+        job = self.export_job
+        if not job.done:
+            self.export_status_label.config(text=f"Exporting... {job.percent()}%")
+            self.root.after(100, self.poll_export, report_type)
+            return
+        
+        self.export_job = None
+        self.export_status_label.config(text="")
+        if job.error is not None:
+            messagebox.showerror("Error", f"Could not export report: {str(job.error)}")
+            return
+        
+        self.notify("Report Exported", f"The {report_type} report has been exported to {job.filename}")
+        self.logger.info(f"Exported {report_type} report with {job.written} sessions to {job.filename}")
@@ -0,0 +1,68 @@
+"""UI-independent building blocks shared by the Pomodoro Timer frontends.
+
+Submodules are imported on first use, so the command line interface does
+not pay for sound, SQLite or threading support it never touches.
+"""
+
+import importlib
+
+
+# Public name -> submodule that defines it
+EXPORTS = {
+    "JournalStore": "journal",
+    "apply_entry": "journal",
+    "empty_data": "journal",
+    "CSV_FIELDS": "export",
+    "ExportJob": "export",
+    "iter_store_rows": "export",
+    "write_csv": "export",
+    "SessionIndex": "index",
+    "DataFileLocked": "lock",
+    "DataLock": "lock",
+    "setup_logging": "logconfig",
+    "stop_logging": "logconfig",
+    "METRICS": "metrics",
+    "Metrics": "metrics",
+    "DesktopNotifier": "notify",
+    "PersistenceWorker": "persistence",
+    "DATE_RANGES": "queries",
+    "date_range_for": "queries",
+    "SessionStore": "records",
+    "build_summary": "reports",
+    "report_range": "reports",
+    "write_summary": "reports",
+    "write_summary_csv": "reports",
+    "write_summary_json": "reports",
+    "Catalog": "registry",
+    "Registry": "registry",
+    "format_task_key": "registry",
+    "SessionRollups": "rollups",
+    "UsageStats": "rollups",
+    "SCHEMA_VERSION": "snapshot",
+    "SnapshotReader": "snapshot",
+    "read_header": "snapshot",
+    "write_snapshot": "snapshot",
+    "SoundPlayer": "sound",
+    "SQLiteStore": "sqlite_store",
+    "migrate_json_to_sqlite": "sqlite_store",
+    "open_store": "storage",
+    "LONG_BREAK": "timer",
+    "POMODORO": "timer",
+    "SHORT_BREAK": "timer",
+    "PomodoroCycle": "timer",
+    "TimerEngine": "timer",
+    "TaskTracker": "tracker",
+    "Typeahead": "typeahead",
+    "retention_days_setting": "tracker",
+}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name):
+    module_name = EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,407 @@
+"""Benchmarks for loading, saving, filtering, deleting and exporting long histories.
+
+Synthetic pomodoro_data.json files are generated for each size, then the
+same code paths the frontends use are timed on them: loading, journalling
+a session and writing a full snapshot, filtering by date range, deleting
+the busiest project, exporting and typeahead completion. When a display is
+available, or Xvfb is installed to provide one, each frontend is also
+launched on the data to time filling the session list.
+
+Usage: python -m pomodoro_core.bench [--sizes 1k,10k,100k] [--output results.json]
+                                     [--baseline old.json] [--threshold 1.25]
+
+Sizes go up to 1m but larger sizes are opt-in, since generating and
+loading them takes a while. Results are written as JSON; comparing them
+with an earlier file prints every benchmark that got slower than its
+threshold allows and exits with status 1, so changes to either UI module
+can be checked against the previous release.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from .registry import Catalog
+from .snapshot import SCHEMA_VERSION, write_snapshot
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTENDS = ("pomodoro_timer.py", "pomodoro_timer_pretty.py")
+
+SESSION_SPACING = timedelta(minutes=30)
+SESSION_LENGTH = timedelta(minutes=25)
+
+# A benchmark regresses when its median is this many times the baseline's
+DEFAULT_THRESHOLD = 1.25
+# Widget timings depend on the display server, so allow them more noise
+THRESHOLDS = {
+    "ui_history": 1.5,
+    "ui_populate_recent": 1.5,
+    "ui_populate_all": 1.5,
+    "ui_delete_project": 1.5,
+}
+# Differences smaller than this are timer noise, whatever the ratio
+NOISE_MS = 5.0
+
+# Keystrokes typed into the task combo by the typeahead benchmark
+TYPED = ("t", "ta", "tas", "task", "task ", "task 1", "p1t")
+
+
+def parse_size(text):
+    """Return the session count for "1000", "10k" or "1m\""""
+    text = text.strip().lower()
+    multiplier = 1
+    if text.endswith("k"):
+        multiplier, text = 1000, text[:-1]
+    elif text.endswith("m"):
+        multiplier, text = 1000000, text[:-1]
+    return int(float(text) * multiplier)
+
+
+def generate_history(data_file, sessions, projects=10, tasks_per_project=10, seed=0):
+    """Write a snapshot with this many sessions, one every 30 minutes up to now.
+
+    Tasks are picked with Zipf-like weights so a few of them, and the
+    first project, get most of the sessions, as in a real history.
+    """
+    catalog = Catalog()
+    for project in range(1, projects + 1):
+        project_id = catalog.add_project(f"Project {project}")
+        for task in range(1, tasks_per_project + 1):
+            catalog.add_task(project_id, f"P{project} task {task}")
+    task_ids = list(catalog.tasks)
+    weights = [1 / rank for rank in range(1, len(task_ids) + 1)]
+    choices = random.Random(seed).choices(task_ids, weights=weights, k=sessions)
+
+    end = datetime.now().replace(second=0, microsecond=0)
+    first = end - SESSION_SPACING * sessions
+
+    def session_dicts():
+        for number, task_id in enumerate(choices):
+            start = first + SESSION_SPACING * number
+            yield {
+                "start_time": start.isoformat(),
+                "end_time": (start + SESSION_LENGTH).isoformat(),
+                "task_id": task_id,
+                "duration_seconds": SESSION_LENGTH.total_seconds()
+            }
+
+    header = dict({"version": SCHEMA_VERSION, "journal_seq": 0}, **catalog.to_header())
+    with open(data_file, "w") as file:
+        write_snapshot(file, header, session_dicts())
+
+
+def time_runs(fn, repeat, setup=None):
+    """Call fn repeat times and return the run times in ms.
+
+    With setup, its result is passed to fn and the time it takes is not counted.
+    """
+    runs = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        started = time.perf_counter()
+        fn(*args)
+        runs.append((time.perf_counter() - started) * 1000)
+    return runs
+
+
+def result(name, sessions, runs, frontend=None):
+    entry = {"name": name, "sessions": sessions}
+    if frontend is not None:
+        entry["frontend"] = frontend
+    entry.update({
+        "min_ms": round(min(runs), 3),
+        "median_ms": round(statistics.median(runs), 3),
+        "runs_ms": [round(ms, 3) for ms in runs]
+    })
+    return entry
+
+
+def fresh_copy(data_file, directory):
+    """Copy data_file into an empty directory and return the copy's path"""
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    copy = os.path.join(directory, "pomodoro_data.json")
+    shutil.copyfile(data_file, copy)
+    return copy
+
+
+def busiest_project(tracker):
+    """Return the name of the project with the most sessions"""
+    sessions = tracker.sessions
+    project_id = max(tracker.catalog.projects, key=lambda project_id: len(sessions.rows_where("project", project_id)))
+    return tracker.catalog.project_name(project_id)
+
+
+def bench_core(data_file, sessions, repeat, scratch):
+    """Time the UI-independent paths on one data file and return their results"""
+    from .export import write_csv
+    from .queries import date_range_for
+    from .reports import write_summary
+    from .tracker import TaskTracker
+
+    results = []
+    today = datetime.now().date()
+
+    def load(path=data_file):
+        tracker = TaskTracker(path, background=False)
+        tracker.load()
+        return tracker
+
+    def load_header():
+        TaskTracker(data_file, background=False).load_header()
+
+    results.append(result("load", sessions, time_runs(load, repeat)))
+    results.append(result("load_header", sessions, time_runs(load_header, repeat)))
+
+    # Anything that writes works on its own copy so every size starts from the same file
+    def loaded_copy():
+        return load(fresh_copy(data_file, scratch))
+
+    tracker = loaded_copy()
+    now = datetime.now()
+    project = tracker.catalog.project_name(next(iter(tracker.catalog.projects)))
+    task = tracker.catalog.task_name(next(iter(tracker.catalog.tasks)))
+    results.append(result("save_session", sessions, time_runs(
+        lambda: tracker.record_session(project, task, now - SESSION_LENGTH, now), repeat)))
+    results.append(result("save_snapshot", sessions, time_runs(tracker.save, repeat)))
+
+    for name, date_filter in (("filter_today", "Today"), ("filter_recent", "Last 30 Days"),
+                              ("filter_all", "All Time")):
+        start_date, end_date = date_range_for(date_filter, today)
+        results.append(result(name, sessions, time_runs(
+            lambda: tracker.rows_between(start_date, end_date, newest_first=True), repeat)))
+    results.append(result("summary", sessions, time_runs(tracker.summary, repeat)))
+
+    csv_file = os.path.join(scratch, "report.csv")
+    summary_file = os.path.join(scratch, "summary.json")
+    results.append(result("export_csv", sessions, time_runs(
+        lambda: write_csv(tracker.iter_sessions(), csv_file), repeat)))
+    results.append(result("export_summary", sessions, time_runs(
+        lambda: write_summary(tracker.summary(), summary_file), repeat)))
+
+    def type_task():
+        for text in TYPED:
+            tracker.complete_tasks(text)
+    results.append(result("typeahead", sessions, time_runs(type_task, repeat)))
+
+    # Every run deletes from a freshly loaded copy, loading it is not timed
+    def busiest_copy():
+        tracker = loaded_copy()
+        name = busiest_project(tracker)
+        return lambda: tracker.delete_project(name)
+    results.append(result("delete_project", sessions, time_runs(lambda delete: delete(), repeat, busiest_copy)))
+    return results
+
+
+def start_virtual_display():
+    """Return (environment, Xvfb process) for launching a frontend, or (None, reason) if there is no display"""
+    if sys.platform in ("win32", "darwin") or os.environ.get("DISPLAY"):
+        return dict(os.environ), None
+    if not shutil.which("Xvfb"):
+        return None, "no DISPLAY and Xvfb is not installed"
+    # Xvfb picks a free display number and writes it to the pipe once it is ready
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24",
+                                "-nolisten", "tcp"], pass_fds=(write_fd,),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        display = pipe.readline().strip()
+    if not display:
+        process.kill()
+        return None, "Xvfb did not start"
+    return dict(os.environ, DISPLAY=f":{display}"), process
+
+
+def bench_frontend(script, repeat):
+    """Launch a frontend on pomodoro_data.json in the current directory and time its session list.
+
+    Runs in a child process started by bench_ui(), prints the results as JSON.
+    """
+    import importlib.util
+    import tkinter as tk
+    from .queries import DATE_RANGES
+
+    frontend = os.path.basename(script)
+    name = os.path.splitext(frontend)[0]
+    spec = importlib.util.spec_from_file_location(name, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    root = tk.Tk()
+    started = time.perf_counter()
+    app = module.PomodoroTimer(root)
+    # The history is shown in the same callback that starts the persistence thread
+    while app.tracker.persistence is None:
+        root.update()
+        time.sleep(0.001)
+    history = (time.perf_counter() - started) * 1000
+    sessions = len(app.tracker.sessions)
+    results = [result("ui_history", sessions, [history], frontend)]
+
+    def populate():
+        app.populate_sessions_tree()
+        root.update_idletasks()
+
+    for bench_name, date_filter in (("ui_populate_recent", DATE_RANGES[3]), ("ui_populate_all", DATE_RANGES[4])):
+        app.date_var.set(date_filter)
+        results.append(result(bench_name, sessions, time_runs(populate, repeat), frontend))
+
+    # Deleting only happens once per launch, with every session listed
+    project = busiest_project(app.tracker)
+
+    def delete():
+        app.remove_sessions_from_tree(app.tracker.delete_project(project))
+        root.update_idletasks()
+    results.append(result("ui_delete_project", sessions, time_runs(delete, 1), frontend))
+
+    app.on_close()
+    print(json.dumps(results))
+
+
+def bench_ui(data_file, frontends, repeat, scratch, env):
+    """Time each frontend in its own process and return the results"""
+    results = []
+    for script in frontends:
+        directory = os.path.join(scratch, "ui")
+        fresh_copy(data_file, directory)
+        child = subprocess.run(
+            [sys.executable, "-m", "pomodoro_core.bench", "--frontend-worker", os.path.abspath(script),
+             "--repeat", str(repeat)],
+            cwd=directory, capture_output=True, text=True,
+            env=dict(env, PYTHONPATH=os.pathsep.join(filter(None, (REPO_DIR, env.get("PYTHONPATH"))))))
+        lines = child.stdout.strip().splitlines()
+        if child.returncode != 0 or not lines:
+            print(f"  {os.path.basename(script)} failed: {child.stderr.strip().splitlines()[-1:]}")
+            continue
+        results.extend(json.loads(lines[-1]))
+    return results
+
+
+def result_key(entry):
+    return entry["name"], entry.get("frontend"), entry["sessions"]
+
+
+def compare(results, baseline, threshold=None):
+    """Return the results whose median regressed against the baseline, as (result, baseline result, limit)"""
+    previous = {result_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        before = previous.get(result_key(entry))
+        if before is None:
+            continue
+        limit = threshold or THRESHOLDS.get(entry["name"], DEFAULT_THRESHOLD)
+        slower = entry["median_ms"] - before["median_ms"]
+        if entry["median_ms"] > before["median_ms"] * limit and slower > NOISE_MS:
+            regressions.append((entry, before, limit))
+    return regressions
+
+
+def format_result(entry):
+    frontend = f" [{entry['frontend']}]" if "frontend" in entry else ""
+    label = f"{entry['name']}{frontend}"
+    return f"  {label:<45} {entry['median_ms']:10.1f} ms  (min {entry['min_ms']:.1f})"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pomodoro_core.bench",
+                                     description="Time the Pomodoro Timer on synthetic histories.")
+    parser.add_argument("--sizes", default="1k,10k,100k",
+                        help="comma separated session counts, e.g. 1k,10k,100k,1m")
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks-per-project", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the median is compared")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="keep generated data files here and reuse them on later runs")
+    parser.add_argument("--frontend", action="append",
+                        help="frontend script to launch, repeatable (default: both)")
+    parser.add_argument("--no-ui", action="store_true", help="skip launching the frontends")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float,
+                        help=f"allowed slowdown ratio for every benchmark (default {DEFAULT_THRESHOLD}, "
+                             f"looser for the frontends)")
+    parser.add_argument("--frontend-worker", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.frontend_worker:
+        bench_frontend(args.frontend_worker, args.repeat)
+        return 0
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    frontends = args.frontend or [os.path.join(REPO_DIR, script) for script in FRONTENDS]
+    env, xvfb = (None, "--no-ui given") if args.no_ui else start_virtual_display()
+    if env is None:
+        print(f"Skipping the frontends: {xvfb}")
+
+    results = []
+    scratch = tempfile.mkdtemp(prefix="pomodoro-bench-")
+    try:
+        data_dir = args.data_dir or scratch
+        os.makedirs(data_dir, exist_ok=True)
+        for sessions in sizes:
+            data_file = os.path.join(
+                data_dir, f"bench_{sessions}_{args.projects}x{args.tasks_per_project}_{args.seed}.json")
+            if not os.path.exists(data_file):
+                print(f"Generating {sessions} sessions...")
+                generate_history(data_file, sessions, args.projects, args.tasks_per_project, args.seed)
+
+            print(f"{sessions} sessions:")
+            size_results = bench_core(data_file, sessions, args.repeat, os.path.join(scratch, "work"))
+            if env is not None:
+                size_results += bench_ui(data_file, frontends, args.repeat, scratch, env)
+            for entry in size_results:
+                print(format_result(entry))
+            results.extend(size_results)
+    finally:
+        if env is not None and xvfb is not None:
+            xvfb.terminate()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "projects": args.projects,
+            "tasks_per_project": args.tasks_per_project,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "frontends": env is not None
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+            file.write("\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+        return 0
+    print(f"Regressions against {args.baseline}:")
+    for entry, before, limit in regressions:
+        print(f"{format_result(entry)}  was {before['median_ms']:.1f} ms, limit x{limit}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
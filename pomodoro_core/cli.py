@@ -0,0 +1,350 @@
+"""Headless command line interface to the Pomodoro Timer data.
+
+Usage: python -m pomodoro_core <command> [options]
+
+    start --project P --task T [--minutes 25]   run a pomodoro in the terminal and record it
+    status                                      show the running timer and today's totals
+    sessions [--range today|yesterday|week|month|all] [--from DATE] [--to DATE]
+    report [--from DATE] [--to DATE] [--format csv|json] [--output FILE]
+    import FILE                                 merge sessions from a CSV export or data file
+    rename --project P [--task T] NEW_NAME      rename a project, or one of its tasks
+
+The commands share the frontends' storage code and never import tkinter.
+start, import and rename write the data file, so they refuse to run while
+a GUI or another of them holds its lock; the other commands only read it.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from .export import dump_csv, iter_store_rows
+from .index import SessionIndex
+from .queries import date_range_for
+from .journal import JournalStore
+from .lock import DataFileLocked
+from .records import to_epoch
+from .registry import format_task_key
+from .reports import build_summary, dump_summary_csv, dump_summary_json
+from .rollups import SessionRollups
+from .storage import open_store
+from .timer import TimerEngine
+from .tracker import MIN_SESSION_SECONDS, TaskTracker
+
+
+RANGES = {
+    "today": "Today",
+    "yesterday": "Yesterday",
+    "week": "Last 7 Days",
+    "month": "Last 30 Days",
+    "all": "All Time",
+}
+
+
+def timer_state_file(data_file):
+    """Return the file a running `start` command advertises itself in"""
+    return os.path.splitext(data_file)[0] + ".timer.json"
+
+
+def format_clock(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def format_hours(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h {rest // 60}m" if hours else f"{rest // 60}m {rest % 60}s"
+
+
+def iter_sessions(store, start_date, end_date):
+    """Yield session tuples in the range, streaming straight from SQLite when possible"""
+    if store.supports_queries:
+        return store.iter_sessions(start_date, end_date)
+    # Sessions before the range are skipped while the data file is parsed
+    sessions = store.load(since=start_date)["sessions"]
+    return iter_store_rows(sessions, SessionIndex(sessions), start_date, end_date)
+
+
+@contextmanager
+def open_tracker(data_file):
+    """Lock the data file and load the history into a tracker that writes every change before returning.
+
+    The tracker is closed, and the lock given up, when the with block ends.
+    """
+    tracker = TaskTracker(data_file, background=False)
+    tracker.lock_data_file()
+    try:
+        tracker.load()
+        yield tracker
+    finally:
+        tracker.close()
+
+
+def open_output(filename):
+    if filename is None or filename == "-":
+        return sys.stdout
+    return open(filename, 'w', newline='')
+
+
+def cmd_start(args):
+    project = args.project
+    task_key = format_task_key(project, args.task)
+    seconds = args.minutes * 60
+    state_file = timer_state_file(args.data_file)
+
+    # The lock is held until the session is recorded, so the GUI can't change the data meanwhile
+    with open_tracker(args.data_file) as tracker:
+        engine = TimerEngine(seconds)
+        start_time = datetime.now()
+        engine.start()
+        with open(state_file, 'w') as file:
+            json.dump({
+                "project": project,
+                "task_key": task_key,
+                "start_time": start_time.isoformat(),
+                "end_time": (start_time + timedelta(seconds=seconds)).isoformat(),
+                "pid": os.getpid()
+            }, file)
+
+        interactive = sys.stderr.isatty()
+        completed = False
+        try:
+            while not engine.expired():
+                if interactive:
+                    print(f"\r{format_clock(engine.remaining())}  {task_key} ", end="", file=sys.stderr, flush=True)
+                time.sleep(engine.ms_until_next_second() / 1000)
+            completed = True
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if interactive:
+                print(file=sys.stderr)
+            if os.path.exists(state_file):
+                os.remove(state_file)
+
+        end_time = datetime.now()
+        if (end_time - start_time).total_seconds() < MIN_SESSION_SECONDS:
+            print("Session shorter than a minute, not recorded")
+            return 0 if completed else 1
+
+        tracker.add_project(project)
+        row = tracker.record_session(project, args.task, start_time, end_time)
+
+        if completed:
+            print("\aPomodoro complete!")
+        print(f"Recorded {format_clock(tracker.sessions.duration[row])} for {task_key}")
+    return 0
+
+
+def cmd_status(args):
+    state_file = timer_state_file(args.data_file)
+    state = None
+    if os.path.exists(state_file):
+        with open(state_file) as file:
+            state = json.load(file)
+
+    if state is not None:
+        remaining = (datetime.fromisoformat(state["end_time"]) - datetime.now()).total_seconds()
+        print(f"Running: {state['task_key']}, {format_clock(max(0, remaining))} left")
+    else:
+        print("No timer running")
+
+    today = datetime.now().date()
+    store = open_store(args.data_file)
+    total_seconds = 0.0
+    count = 0
+    for session in iter_sessions(store, today, today):
+        total_seconds += session[4]
+        count += 1
+    print(f"Today: {count} sessions, {format_hours(total_seconds)}")
+    return 0
+
+
+def cmd_sessions(args):
+    start_date, end_date = date_range_for(RANGES[args.range], datetime.now().date())
+    if args.start_date is not None:
+        start_date = args.start_date
+    if args.end_date is not None:
+        end_date = args.end_date
+
+    store = open_store(args.data_file)
+    output = open_output(args.output)
+    try:
+        dump_csv(iter_sessions(store, start_date, end_date), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def cmd_report(args):
+    # Read without the lock, so reports also run while the GUI is open
+    sessions = open_store(args.data_file).load(since=args.start_date)["sessions"]
+    summary = build_summary(SessionRollups(sessions), args.start_date, args.end_date)
+
+    output = open_output(args.output)
+    try:
+        if args.format == "json":
+            dump_summary_json(summary, output)
+        else:
+            dump_summary_csv(summary, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+# Columns of a session export that import reads
+IMPORT_FIELDS = ("Date", "Start Time", "End Time", "Project", "Task")
+
+
+def read_import_file(filename):
+    """Return (projects, tasks, sessions) from a data file or a CSV session export.
+
+    tasks are (project, task) pairs and sessions are dicts that name their
+    project and task, whichever version of the data file they came from.
+    """
+    if filename.lower().endswith(".json"):
+        data = JournalStore(filename).load()
+        catalog = data["catalog"]
+        recorded = data["sessions"]
+        tasks = [(catalog.project_name(catalog.task_project(task_id)), catalog.task_name(task_id))
+                 for task_id in catalog.tasks]
+        sessions = [dict(recorded.to_dict(row), project=recorded.project_name(row), task=recorded.task_name(row))
+                    for row in recorded.rows()]
+        return catalog.project_list(), tasks, sessions
+
+    sessions = []
+    with open(filename, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        missing = [field for field in IMPORT_FIELDS if field not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{filename} is not a session export, it has no {', '.join(missing)} column")
+        for record in reader:
+            start_time = datetime.fromisoformat(f"{record['Date']} {record['Start Time']}")
+            end_time = datetime.fromisoformat(f"{record['Date']} {record['End Time']}")
+            if end_time < start_time:
+                # The session ran past midnight
+                end_time += timedelta(days=1)
+            sessions.append({
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+                "project": record["Project"],
+                "task": record["Task"],
+                "duration_seconds": (end_time - start_time).total_seconds()
+            })
+    return [], [], sessions
+
+
+def cmd_import(args):
+    projects, tasks, sessions = read_import_file(args.file)
+
+    # A session needs both names to be filed under a task
+    named = [session for session in sessions if session["project"].strip() and session["task"].strip()]
+    if len(named) < len(sessions):
+        print(f"Skipped {len(sessions) - len(named)} sessions without a project or task", file=sys.stderr)
+    sessions = named
+
+    with open_tracker(args.data_file) as tracker:
+        for project in dict.fromkeys(projects + [session["project"] for session in sessions]):
+            tracker.add_project(project)
+        for project, task in dict.fromkeys(tasks + [(session["project"], session["task"]) for session in sessions]):
+            tracker.add_task(project, task)
+
+        # Exports only keep whole seconds, so match sessions on those
+        recorded = tracker.sessions
+        seen = {(int(recorded.start[row]), recorded.task[row]) for row in recorded.rows()}
+        new_sessions = []
+        for session in sessions:
+            task_id = tracker.task_id(session["project"], session["task"])
+            key = (int(to_epoch(session["start_time"])), task_id)
+            if key not in seen:
+                seen.add(key)
+                new_sessions.append({
+                    "start_time": session["start_time"],
+                    "end_time": session["end_time"],
+                    "task_id": task_id,
+                    "duration_seconds": session["duration_seconds"]
+                })
+
+        if new_sessions:
+            tracker.add_sessions(new_sessions)
+    print(f"Imported {len(new_sessions)} sessions, skipped {len(sessions) - len(new_sessions)} already present")
+    return 0
+
+
+def cmd_rename(args):
+    with open_tracker(args.data_file) as tracker:
+        if args.task is None:
+            if not tracker.rename_project(args.project, args.new_name):
+                print(f"Could not rename project {args.project!r} to {args.new_name!r}", file=sys.stderr)
+                return 1
+            print(f"Renamed project {args.project} to {args.new_name}")
+            return 0
+
+        task_id = tracker.task_id(args.project, args.task)
+        if task_id is None or not tracker.rename_task(task_id, args.new_name):
+            print(f"Could not rename task {args.task!r} of {args.project!r} to {args.new_name!r}", file=sys.stderr)
+            return 1
+        print(f"Renamed {format_task_key(args.project, args.task)} to {tracker.task_key(task_id)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pomodoro", description="Pomodoro Timer without the GUI")
+    parser.add_argument("--data-file", default="pomodoro_data.json",
+                        help="data file shared with the GUI (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="run a pomodoro and record it as a session")
+    start.add_argument("--project", required=True)
+    start.add_argument("--task", required=True)
+    start.add_argument("--minutes", type=int, default=25)
+    start.set_defaults(handler=cmd_start)
+
+    status = commands.add_parser("status", help="show the running timer and today's totals")
+    status.set_defaults(handler=cmd_status)
+
+    sessions = commands.add_parser("sessions", help="print sessions as CSV")
+    sessions.add_argument("--range", choices=list(RANGES), default="today")
+    sessions.add_argument("--from", dest="start_date", type=date.fromisoformat, help="YYYY-MM-DD")
+    sessions.add_argument("--to", dest="end_date", type=date.fromisoformat, help="YYYY-MM-DD")
+    sessions.add_argument("--output", help="write to a file instead of stdout")
+    sessions.set_defaults(handler=cmd_sessions)
+
+    report = commands.add_parser("report", help="print a summary report")
+    report.add_argument("--from", dest="start_date", type=date.fromisoformat, help="YYYY-MM-DD")
+    report.add_argument("--to", dest="end_date", type=date.fromisoformat, help="YYYY-MM-DD")
+    report.add_argument("--format", choices=["csv", "json"], default="csv")
+    report.add_argument("--output", help="write to a file instead of stdout")
+    report.set_defaults(handler=cmd_report)
+
+    importer = commands.add_parser("import", help="merge sessions from a CSV export or pomodoro_data.json")
+    importer.add_argument("file")
+    importer.set_defaults(handler=cmd_import)
+
+    rename = commands.add_parser("rename", help="rename a project or task, its sessions follow")
+    rename.add_argument("--project", required=True)
+    rename.add_argument("--task", help="rename this task of the project instead of the project")
+    rename.add_argument("new_name")
+    rename.set_defaults(handler=cmd_rename)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (DataFileLocked, OSError, ValueError) as e:
+        print(f"pomodoro: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import csv
+import logging
+import threading
+
+from .metrics import METRICS
+
+
+logger = logging.getLogger('pomodoro.export')
+
+CSV_FIELDS = ['Date', 'Start Time', 'End Time', 'Project', 'Task', 'Duration (min)']
+
+# Rows are collected in a large write buffer instead of hitting the disk per line
+BUFFER_SIZE = 1 << 16
+
+
+def iter_store_rows(store, index, start_date=None, end_date=None):
+    """Yield (start, end, project, task, duration_seconds) tuples, oldest first"""
+    for row in index.iter_between(start_date, end_date):
+        # The UI thread may delete sessions while an export is running
+        if store.alive[row]:
+            yield (store.start_datetime(row), store.end_datetime(row),
+                   store.project_name(row), store.task_name(row), store.duration[row])
+
+
+def write_csv(rows, filename, progress=None, every=1000):
+    """Stream session tuples into a CSV report and return how many were written.
+
+    rows may be any iterable, it is consumed one session at a time so memory
+    use does not depend on the size of the range being exported.
+    """
+    with open(filename, 'w', newline='', buffering=BUFFER_SIZE) as csvfile:
+        return dump_csv(rows, csvfile, progress, every)
+
+
+def dump_csv(rows, csvfile, progress=None, every=1000):
+    """Write session tuples to an open text file, see write_csv()"""
+    count = 0
+    writer = csv.writer(csvfile)
+    writer.writerow(CSV_FIELDS)
+    for start_time, end_time, project, task, duration_seconds in rows:
+        writer.writerow((
+            start_time.strftime("%Y-%m-%d"),
+            start_time.strftime("%H:%M:%S"),
+            end_time.strftime("%H:%M:%S"),
+            project,
+            task,
+            f"{duration_seconds / 60:.1f}"
+        ))
+        count += 1
+        if progress is not None and count % every == 0:
+            progress(count)
+    return count
+
+
+class ExportJob:
+    """Run write_csv on a background thread.
+
+    The UI polls ``written``, ``done`` and ``error`` from its own event loop;
+    the job never touches any widgets.
+    """
+
+    def __init__(self, rows, filename, total):
+        self.rows = rows
+        self.filename = filename
+        self.total = total
+        self.written = 0
+        self.done = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="pomodoro-export", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def percent(self):
+        if not self.total:
+            return 100
+        return min(100, int(self.written * 100 / self.total))
+
+    def run(self):
+        try:
+            with METRICS.timed("export_csv"):
+                self.written = write_csv(self.rows, self.filename, progress=self.report_progress)
+            METRICS.increment("exported_sessions", self.written)
+        except Exception as e:
+            logger.error(f"Error exporting report: {str(e)}")
+            self.error = e
+        finally:
+            self.done = True
+
+    def report_progress(self, count):
+        self.written = count
@@ -0,0 +1,103 @@
+import bisect
+
+from .records import DAY, day_number
+
+
+class SessionIndex:
+    """Session rows partitioned by the calendar day they started on.
+
+    Each day keeps its row ids sorted by start time, and the days themselves
+    are kept in a sorted list, so a date range lookup only visits the days
+    inside the range. Start times come straight from the store's epoch
+    column, nothing is parsed at query time.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self.days = {}
+        self.day_keys = []
+        if store is not None:
+            self.build(store)
+
+    def build(self, store):
+        """Rebuild the index from scratch for every live row in store"""
+        self.store = store
+        start = store.start
+        days = {}
+        for row in store.rows():
+            days.setdefault(int(start[row] // DAY), []).append(row)
+
+        for rows in days.values():
+            rows.sort(key=start.__getitem__)
+        self.days = days
+        self.day_keys = sorted(days)
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.days.values())
+
+    def add(self, row):
+        """Insert a row at its sorted position within its day"""
+        start = self.store.start
+        row_start = start[row]
+        day = int(row_start // DAY)
+        if day not in self.days:
+            self.days[day] = []
+            bisect.insort(self.day_keys, day)
+
+        rows = self.days[day]
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low + high) // 2
+            if start[rows[middle]] <= row_start:
+                low = middle + 1
+            else:
+                high = middle
+        rows.insert(low, row)
+
+    def remove(self, rows):
+        """Remove rows, touching only the days they started on"""
+        start = self.store.start
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(int(start[row] // DAY), set()).add(row)
+
+        for day, doomed in by_day.items():
+            if day not in self.days:
+                continue
+            kept = [row for row in self.days[day] if row not in doomed]
+            if kept:
+                self.days[day] = kept
+            else:
+                del self.days[day]
+                self.day_keys.remove(day)
+
+    def days_between(self, start_date=None, end_date=None):
+        """Return the sorted day keys inside the date range"""
+        low = 0 if start_date is None else bisect.bisect_left(self.day_keys, day_number(start_date))
+        high = len(self.day_keys) if end_date is None else bisect.bisect_right(self.day_keys, day_number(end_date))
+        return self.day_keys[low:high]
+
+    def count_between(self, start_date=None, end_date=None):
+        return sum(len(self.days[day]) for day in self.days_between(start_date, end_date))
+
+    def iter_between(self, start_date=None, end_date=None):
+        """Lazily yield rows in the date range, oldest first, one day at a time"""
+        for day in self.days_between(start_date, end_date):
+            # Copy the day so a concurrent insert can't disturb the iteration
+            yield from list(self.days.get(day, ()))
+
+    def between(self, start_date=None, end_date=None, newest_first=False):
+        """Return the row ids of sessions that started in the date range.
+
+        Either bound may be None for an open range. Rows are ordered by
+        start time, oldest first unless newest_first is set.
+        """
+        days = self.days_between(start_date, end_date)
+        rows = []
+        if newest_first:
+            for day in reversed(days):
+                rows.extend(reversed(self.days[day]))
+        else:
+            for day in days:
+                rows.extend(self.days[day])
+        return rows
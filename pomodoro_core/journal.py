@@ -0,0 +1,319 @@
+import json
+import logging
+import os
+
+from .metrics import METRICS
+from .records import DAY, SessionStore, day_number, to_epoch
+from .registry import Catalog
+from .snapshot import HEADER_KEYS, SCHEMA_VERSION, SnapshotReader, read_header, write_snapshot
+from .upgrade import V1Upgrade, is_v1_entry
+
+
+logger = logging.getLogger('pomodoro.journal')
+
+
+def empty_data():
+    """Return an empty data document: a Catalog and a SessionStore that refers to it"""
+    catalog = Catalog()
+    return {"catalog": catalog, "sessions": SessionStore(catalog)}
+
+
+def apply_entry(data, entry):
+    """Apply a single journal entry to a data document in place"""
+    catalog = data["catalog"]
+    sessions = data["sessions"]
+    op = entry.get("op")
+
+    if op == "add_project":
+        catalog.add_project(entry["name"], entry["project_id"])
+    elif op == "rename_project":
+        catalog.rename_project(entry["project_id"], entry["name"])
+    elif op == "delete_project":
+        sessions.remove(sessions.rows_where("project", entry["project_id"]))
+        catalog.remove_project(entry["project_id"])
+    elif op == "add_task":
+        catalog.add_task(entry["project_id"], entry["name"], entry["task_id"])
+    elif op == "rename_task":
+        catalog.rename_task(entry["task_id"], entry["name"])
+    elif op == "delete_task":
+        sessions.remove(sessions.rows_where("task", entry["task_id"]))
+        catalog.remove_task(entry["task_id"])
+    elif op == "add_session":
+        sessions.add(entry["session"])
+    else:
+        logger.warning(f"Ignoring unknown journal entry: {op}")
+
+
+class JournalStore:
+    """Snapshot file plus an append-only journal of mutations.
+
+    The snapshot is pomodoro_data.json in the SCHEMA_VERSION layout: the
+    projects and tasks with their ids, then sessions that refer to their
+    task by id. Every change is appended to ``<data_file>.journal`` as one JSON line, so a save costs
+    the size of the change rather than the size of the whole history. Once
+    the journal grows past ``compact_every`` entries the caller folds it into
+    a fresh snapshot with compact().
+
+    Entries carry a sequence number and the snapshot remembers the last one
+    it folded in, so a crash between writing the snapshot and removing the
+    journal never replays a change twice.
+
+    Reading never modifies the files, so a read-only command can load while
+    another process is appending. A torn last line is ignored when read and
+    only cut off by the writer, just before its next append.
+
+    load() streams the snapshot's sessions straight into a SessionStore.
+    Sessions that started before ``since`` are left out of memory but not
+    out of the file: compact() copies them across from the previous
+    snapshot, minus any whose task has been deleted.
+
+    Version 1 snapshots and journal entries, which name tasks by their
+    "project: task" key, are converted while they are read. needs_compaction()
+    is then True so the caller writes the data back in the new layout.
+    """
+
+    supports_queries = False
+
+    def __init__(self, data_file, compact_every=200):
+        self.data_file = data_file
+        self.journal_file = data_file + ".journal"
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        # Bytes of valid entries at the start of the journal, None until it has been read
+        self.journal_size = None
+        self.seq = 0
+        # Epoch seconds before which snapshot sessions were left on disk
+        self.horizon = None
+        self.archived = 0
+        self.deleted_tasks = set()
+        self.migrated = False
+
+    def load(self, since=None):
+        """Load the snapshot and replay the journal tail on top of it.
+
+        Returns a data document like empty_data(). Snapshot sessions that
+        started before the date since are skipped, journalled sessions are
+        always kept.
+        """
+        data = empty_data()
+        upgrade = None
+        snapshot_seq = 0
+        self.horizon = day_number(since) * DAY if since is not None else None
+        self.archived = 0
+        self.deleted_tasks = set()
+        self.migrated = False
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, "r") as file:
+                    reader = SnapshotReader(file)
+                    if not reader.header():
+                        raise reader.error("Expecting object")
+                    data, upgrade = self.read_snapshot(reader)
+                snapshot_seq = reader.values.get("journal_seq", 0)
+            except (json.JSONDecodeError, FileNotFoundError):
+                data = empty_data()
+                upgrade = None
+                self.archived = 0
+
+        if self.archived:
+            logger.info(f"Left {self.archived} sessions before {since} in {self.data_file}")
+
+        self.seq = snapshot_seq
+        self.journal_entries = 0
+        for entry in self.read_journal():
+            seq = entry.get("seq", 0)
+            if seq and seq <= snapshot_seq:
+                continue
+            if is_v1_entry(entry):
+                if upgrade is None:
+                    upgrade = V1Upgrade(data["catalog"], data["sessions"])
+                upgrade.apply(entry)
+            else:
+                apply_entry(data, entry)
+                self.note_deletion(entry.get("op"), entry)
+            self.seq = max(self.seq, seq)
+            self.journal_entries += 1
+
+        if upgrade is not None:
+            self.migrated = True
+            logger.info(f"Converted {self.data_file} to data format version {SCHEMA_VERSION}")
+        return data
+
+    def read_snapshot(self, reader):
+        """Stream a snapshot into a new data document, returns it and the V1Upgrade used, if any"""
+        values = reader.values
+        version = values.get("version", 1)
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"{self.data_file} uses data format version {version}, "
+                             f"this version only reads up to {SCHEMA_VERSION}")
+
+        if version == 1:
+            # Converted in full, so the new snapshot can be written from memory
+            data = empty_data()
+            upgrade = V1Upgrade(data["catalog"], data["sessions"])
+            upgrade.read_header(values)
+            for session in reader.sessions():
+                upgrade.add_session(session)
+            # Early snapshots list the tasks after the sessions
+            upgrade.read_header(values)
+            return data, upgrade
+
+        catalog = Catalog.from_header(values)
+        data = {"catalog": catalog, "sessions": SessionStore(catalog)}
+        self.read_sessions(reader.sessions(), data["sessions"])
+        return data, None
+
+    def read_sessions(self, snapshot_sessions, sessions):
+        """Add streamed snapshot sessions to a SessionStore, skipping those before the horizon"""
+        horizon = self.horizon
+        add_record = sessions.add_record
+        task_info = sessions.catalog.task_info
+        unknown = 0
+        for session in snapshot_sessions:
+            start = to_epoch(session["start_time"])
+            if horizon is not None and start < horizon:
+                self.archived += 1
+                continue
+            task_id = session["task_id"]
+            task = task_info.get(task_id)
+            if task is None:
+                unknown += 1
+                continue
+            add_record(start, to_epoch(session["end_time"]), task[0], task_id, session["duration_seconds"])
+        if unknown:
+            logger.warning(f"Skipped {unknown} sessions of unknown tasks in {self.data_file}")
+
+    def note_deletion(self, op, payload):
+        # Sessions left on disk by load(since=...) must not outlive their task
+        if op == "delete_project":
+            self.deleted_tasks.update(payload["task_ids"])
+        elif op == "delete_task":
+            self.deleted_tasks.add(payload["task_id"])
+
+    def load_header(self):
+        """Return a Catalog of the projects and tasks without reading the sessions, or None if that is not possible"""
+        values = {}
+        if os.path.exists(self.data_file):
+            try:
+                values = read_header(self.data_file)
+            except ValueError:
+                values = None
+            # Version 1 snapshots are only converted by a full load
+            if values is None or values.get("version", 1) != SCHEMA_VERSION:
+                return None
+
+        catalog = Catalog.from_header(values)
+        data = {"catalog": catalog, "sessions": SessionStore(catalog)}
+        snapshot_seq = values.get("journal_seq", 0)
+        for entry in self.read_journal():
+            seq = entry.get("seq", 0)
+            if seq and seq <= snapshot_seq:
+                continue
+            if is_v1_entry(entry):
+                return None
+            if entry.get("op") != "add_session":
+                apply_entry(data, entry)
+        return catalog
+
+    def read_journal(self):
+        """Return the valid journal entries, ignoring a torn last line"""
+        if not os.path.exists(self.journal_file):
+            self.journal_size = 0
+            return []
+
+        entries = []
+        good_offset = 0
+        with open(self.journal_file, "rb") as file:
+            for line in file:
+                # A line without its newline was cut off mid-write
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+                good_offset += len(line)
+            size = file.seek(0, os.SEEK_END)
+
+        if good_offset < size:
+            # May still be being written by another process, append_many() cuts it off
+            logger.warning(f"Ignoring {size - good_offset} bytes of torn journal data in {self.journal_file}")
+        self.journal_size = good_offset
+        return entries
+
+    def append(self, op, **payload):
+        """Append a single mutation to the journal"""
+        self.append_many([(op, payload)])
+
+    def append_many(self, changes):
+        """Append a batch of (op, payload) mutations with a single write"""
+        lines = []
+        for op, payload in changes:
+            self.note_deletion(op, payload)
+            self.seq += 1
+            lines.append(json.dumps(dict(payload, op=op, seq=self.seq), sort_keys=True) + "\n")
+        with METRICS.timed("save_journal"), open(self.journal_file, "ab") as file:
+            # Entries after a torn line would never be read back, so drop it first
+            size = file.tell()
+            if self.journal_size is not None and size > self.journal_size:
+                logger.warning(f"Discarding {size - self.journal_size} bytes of torn journal data "
+                               f"in {self.journal_file}")
+                file.truncate(self.journal_size)
+            file.write("".join(lines).encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+            self.journal_size = os.fstat(file.fileno()).st_size
+        self.journal_entries += len(lines)
+        METRICS.increment("journal_entries", len(lines))
+
+    def needs_compaction(self):
+        return self.migrated or self.journal_entries >= self.compact_every
+
+    def compact(self, data):
+        """Write a full snapshot of data and start a fresh journal"""
+        # Projects and tasks go first so load_header() can stop before the sessions
+        header = {"version": SCHEMA_VERSION, "journal_seq": self.seq}
+        for key in HEADER_KEYS[2:]:
+            header[key] = data[key]
+        temp_file = self.data_file + ".tmp"
+        with METRICS.timed("save_snapshot"), open(temp_file, "w") as file:
+            write_snapshot(file, header, self.snapshot_sessions(data["sessions"]))
+            file.flush()
+            os.fsync(file.fileno())
+        # Readers see either the old snapshot or the new one, never a partial file
+        os.replace(temp_file, self.data_file)
+
+        # The snapshot now includes every journalled change
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.journal_entries = 0
+        self.journal_size = 0
+        self.deleted_tasks = set()
+        self.migrated = False
+
+    def snapshot_sessions(self, sessions):
+        """Yield the session dicts for a new snapshot, including those left on disk"""
+        if self.archived:
+            yield from self.archived_sessions(sessions)
+        # The SessionStore copy is expanded back to the JSON schema one row at a time
+        for row in sessions.rows():
+            yield sessions.to_dict(row)
+
+    def archived_sessions(self, sessions):
+        """Stream the sessions before the horizon from the current snapshot"""
+        # Sessions before the horizon that are also in memory came from the
+        # journal and are written with the rest of the store
+        in_memory = {(sessions.start[row], sessions.task[row])
+                     for row in sessions.rows() if sessions.start[row] < self.horizon}
+        archived = 0
+        with open(self.data_file, "r") as file:
+            reader = SnapshotReader(file)
+            reader.header()
+            for session in reader.sessions():
+                if session["task_id"] in self.deleted_tasks:
+                    continue
+                start = to_epoch(session["start_time"])
+                if start < self.horizon and (start, session["task_id"]) not in in_memory:
+                    archived += 1
+                    yield session
+        self.archived = archived
@@ -0,0 +1,84 @@
+"""Keep two programs from writing the same data file at once.
+
+The GUIs and the commands that change the data take an exclusive lock on
+pomodoro_data.lock, next to the data file, for as long as they may write
+to it. The lock is held by the operating system on the open file, so it
+goes away with the program even if it crashes; the file itself is left
+behind and only names the process that last held it.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def try_lock(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def unlock(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def try_lock(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def unlock(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class DataFileLocked(Exception):
+    """Another program has the data file open for writing"""
+
+
+def lock_file(data_file):
+    """Return the lock file of a data file, shared by its JSON and SQLite stores"""
+    return os.path.splitext(data_file)[0] + ".lock"
+
+
+class DataLock:
+    """Exclusive lock on a data file, taken with acquire() and given up with release()"""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.path = lock_file(data_file)
+        self.file = None
+
+    def acquire(self):
+        """Take the lock without waiting, raises DataFileLocked if another program holds it"""
+        if self.file is not None:
+            return
+        file = open(self.path, "a+")
+        try:
+            try_lock(file)
+        except OSError:
+            owner = self.owner(file)
+            file.close()
+            held_by = f" (process {owner})" if owner else ""
+            raise DataFileLocked(f"{self.data_file} is in use by another Pomodoro Timer{held_by}")
+        file.seek(0)
+        file.truncate()
+        file.write(f"{os.getpid()}\n")
+        file.flush()
+        self.file = file
+
+    def release(self):
+        if self.file is None:
+            return
+        try:
+            unlock(self.file)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def owner(self, file):
+        """Return the process id written by the lock's holder, if it can be read"""
+        try:
+            file.seek(0)
+            return file.read().strip()
+        except OSError:
+            # Windows does not let anyone else read the locked byte
+            return ""
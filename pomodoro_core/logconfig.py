@@ -0,0 +1,99 @@
+"""Application log set up for the frontends.
+
+Loggers only put records on a queue; a QueueListener thread formats them
+and writes them to the console and to pomodoro_app.log, so logging costs
+the Tk thread a queue put. The log file is rotated once it reaches
+LOG_MAX_BYTES, keeping LOG_BACKUPS older files next to it.
+
+Levels are set per subsystem logger (pomodoro.tracker, pomodoro.sound,
+...) from LOG_LEVELS and POMODORO_LOG_LEVELS, for example
+POMODORO_LOG_LEVELS=persistence=warning,sound=debug.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+
+LOG_FILE = "pomodoro_app.log"
+LOG_MAX_BYTES = 1 << 20
+LOG_BACKUPS = 3
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+LEVELS_ENV = "POMODORO_LOG_LEVELS"
+
+# Logger name -> level; names without a dot are under "pomodoro"
+LOG_LEVELS = {"pomodoro": "INFO"}
+
+# The running listener, so a second window does not add a second set of handlers
+listener = None
+
+
+def logger_name(name):
+    name = name.strip()
+    if name == "pomodoro" or name.startswith("pomodoro."):
+        return name
+    return f"pomodoro.{name}"
+
+
+def log_levels_setting():
+    """Return {logger name: level} from LOG_LEVELS overridden by POMODORO_LOG_LEVELS"""
+    levels = {logger_name(name): level for name, level in LOG_LEVELS.items()}
+    for item in os.environ.get(LEVELS_ENV, "").split(","):
+        name, separator, level = item.partition("=")
+        if not separator:
+            continue
+        level = level.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            logging.getLogger('pomodoro').warning(f"Ignoring unknown log level in {LEVELS_ENV}: {item!r}")
+            continue
+        levels[logger_name(name)] = level
+    return levels
+
+
+def setup_logging(filename=LOG_FILE, console=True):
+    """Route every log record through a queue to a rotating log file and the console.
+
+    Safe to call more than once; only the first call installs the handlers.
+    """
+    global listener
+    if listener is not None:
+        return listener
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True)
+    handlers = [file_handler]
+    # Windowed builds have no console to write to
+    if console and sys.stderr is not None:
+        handlers.append(logging.StreamHandler())
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.INFO)
+    for name, level in log_levels_setting().items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, *handlers)
+    listener.start()
+    return listener
+
+
+def stop_logging():
+    """Write out the queued records and stop the writer thread"""
+    global listener
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    listener = None
@@ -0,0 +1,133 @@
+"""In-memory timings and counters for the hot paths of the application.
+
+Loading, saving, exporting and the frontends' refreshes and timer ticks
+record into the shared METRICS registry. Each timing goes into a histogram
+with fixed buckets, so memory use stays the same however long the window
+is open. The pretty UI shows the registry in its diagnostics panel;
+setting POMODORO_METRICS_FILE to a file name also writes it there as JSON
+when either frontend is closed.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+METRICS_ENV = "POMODORO_METRICS_FILE"
+
+# Upper bounds of the histogram buckets in ms, the last bucket is open ended
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histogram:
+    """Count, total, extremes and bucket counts of a series of timings in ms"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.last = None
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        self.last = ms
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding that fraction of the timings"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        bound = BUCKETS_MS[bucket] if bucket < len(BUCKETS_MS) else self.max
+        return min(bound, self.max)
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": None if not self.count else round(self.mean(), 3),
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "last_ms": self.last,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {label: count for label, count in zip(labels, self.buckets) if count}
+        }
+
+
+class Metrics:
+    """Named counters and timing histograms, safe to update from any thread"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.counters = {}
+            self.histograms = {}
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, ms):
+        """Add a timing in milliseconds to the named histogram"""
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    @contextmanager
+    def timed(self, name):
+        """Time the with block into the named histogram, whether or not it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def snapshot(self):
+        """Return the counters and histograms as a JSON-ready dict"""
+        with self.lock:
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "counters": dict(sorted(self.counters.items())),
+                "histograms": {name: self.histograms[name].to_dict() for name in sorted(self.histograms)}
+            }
+
+    def dump(self, filename):
+        with open(filename, "w") as file:
+            json.dump(self.snapshot(), file, indent=4)
+            file.write("\n")
+
+    def record(self, filename=None):
+        """Dump to the file named by POMODORO_METRICS_FILE, if set"""
+        filename = filename or os.environ.get(METRICS_ENV)
+        if filename:
+            self.dump(filename)
+
+
+# Shared by every module, like the loggers
+METRICS = Metrics()
@@ -0,0 +1,24 @@
+"""One-shot migration of pomodoro_data.json into a SQLite database.
+
+Usage: python -m pomodoro_core.migrate [pomodoro_data.json] [pomodoro_data.db]
+"""
+
+import os
+import sys
+
+from .lock import DataFileLocked, DataLock
+from .sqlite_store import migrate_json_to_sqlite
+
+
+if __name__ == "__main__":
+    json_file = sys.argv[1] if len(sys.argv) > 1 else "pomodoro_data.json"
+    db_file = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(json_file)[0] + ".db"
+    # The GUIs would go on writing the JSON file after it has been copied
+    data_lock = DataLock(json_file)
+    try:
+        data_lock.acquire()
+    except DataFileLocked as e:
+        sys.exit(f"Cannot migrate: {e}")
+    count = migrate_json_to_sqlite(json_file, db_file)
+    data_lock.release()
+    print(f"Migrated {count} sessions to {db_file}")
@@ -0,0 +1,88 @@
+import json
+import logging
+import queue
+import sys
+import threading
+
+
+logger = logging.getLogger('pomodoro.notify')
+
+APP_NAME = "Pomodoro Timer"
+
+# How long the desktop shows a notification, in ms
+EXPIRE_MS = 8000
+
+
+def gvariant_string(text):
+    """Quote text as a GVariant string literal for gdbus"""
+    return json.dumps(text, ensure_ascii=False)
+
+
+def dbus_command(gdbus, title, message):
+    """Return the gdbus call of org.freedesktop.Notifications.Notify for a notification"""
+    return [gdbus, "call", "--session",
+            "--dest", "org.freedesktop.Notifications",
+            "--object-path", "/org/freedesktop/Notifications",
+            "--method", "org.freedesktop.Notifications.Notify",
+            gvariant_string(APP_NAME), "0", '""', gvariant_string(title), gvariant_string(message),
+            "[]", "{}", str(EXPIRE_MS)]
+
+
+class DesktopNotifier:
+    """Send freedesktop desktop notifications on a background thread.
+
+    notify() only puts the notification on a queue, so a slow or missing
+    notification daemon never holds up the timer. Notifications go over
+    the session D-Bus with gdbus, or notify-send where gdbus is missing;
+    on other platforms, or with neither installed, they are only logged.
+    Pass send to replace the D-Bus call, e.g. with a stub in development.
+    """
+
+    def __init__(self, send=None):
+        self.send = send
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def notify(self, title, message):
+        """Queue a notification and return immediately"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="pomodoro-notify", daemon=True)
+            self.thread.start()
+        self.queue.put((title, message))
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+
+    def run(self):
+        if self.send is None:
+            self.send = self.find_sender()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self.send(*item)
+            except Exception as e:
+                logger.error(f"Error sending desktop notification: {str(e)}")
+
+    def find_sender(self):
+        """Return a function that sends a notification with the tools available here"""
+        import shutil
+        import subprocess
+
+        def run(command):
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=10)
+
+        if sys.platform not in ("win32", "darwin"):
+            gdbus = shutil.which("gdbus")
+            if gdbus:
+                return lambda title, message: run(dbus_command(gdbus, title, message))
+            notify_send = shutil.which("notify-send")
+            if notify_send:
+                return lambda title, message: run([notify_send, "--app-name", APP_NAME,
+                                                   "--expire-time", str(EXPIRE_MS), title, message])
+
+        def log_only(title, message):
+            logger.info(f"Desktop notifications are not available, skipped: {title}")
+        return log_only
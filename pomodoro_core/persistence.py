@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('pomodoro.persistence')
+
+
+class PersistenceWorker:
+    """Write store changes on a background thread.
+
+    The UI thread only queues changes and snapshots. The worker waits for a
+    debounce window after the first queued item so a burst of edits is
+    written as one batch, and a queued snapshot replaces every change queued
+    before it since the snapshot already contains them.
+    """
+
+    def __init__(self, store, debounce=0.5):
+        self.store = store
+        self.debounce = debounce
+        self.pending = []
+        self.writing = False
+        self.flush_requested = False
+        self.closing = False
+        self.changes_since_snapshot = store.journal_entries
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="pomodoro-persistence", daemon=True)
+        self.thread.start()
+
+    def submit(self, op, **payload):
+        """Queue a single change for the store"""
+        with self.condition:
+            self.pending.append(("change", op, payload))
+            self.changes_since_snapshot += 1
+            self.condition.notify_all()
+
+    def compact(self, data):
+        """Queue a full snapshot of data; the caller must not mutate the lists afterwards"""
+        with self.condition:
+            self.pending.append(("snapshot", None, data))
+            self.changes_since_snapshot = 0
+            self.condition.notify_all()
+
+    def needs_compaction(self):
+        compact_every = self.store.compact_every
+        return compact_every is not None and self.changes_since_snapshot >= compact_every
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        with self.condition:
+            if not self.pending and not self.writing:
+                return
+            self.flush_requested = True
+            self.condition.notify_all()
+            while self.pending or self.writing:
+                self.condition.wait()
+
+    def close(self):
+        """Flush outstanding writes and stop the worker thread"""
+        self.flush()
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closing:
+                    self.condition.wait()
+                if self.closing and not self.pending:
+                    return
+
+                # Let a burst of changes pile up before touching the disk
+                deadline = time.monotonic() + self.debounce
+                while not self.flush_requested and not self.closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                batch = self.pending
+                self.pending = []
+                self.writing = True
+
+            try:
+                self.write(batch)
+            except Exception as e:
+                logger.error(f"Error saving data: {str(e)}")
+            finally:
+                with self.condition:
+                    self.writing = False
+                    if not self.pending:
+                        self.flush_requested = False
+                    self.condition.notify_all()
+
+    def write(self, batch):
+        changes = [(op, payload) for kind, op, payload in batch if kind == "change"]
+        snapshots = [i for i, (kind, _, _) in enumerate(batch) if kind == "snapshot"]
+
+        # Changes queued before the last snapshot are already part of it
+        if snapshots and self.store.compact_every is not None:
+            last = snapshots[-1]
+            data = batch[last][2]
+            # Deletions must still reach sessions the store left on disk
+            for kind, op, payload in batch[:last]:
+                if kind == "change":
+                    self.store.note_deletion(op, payload)
+            try:
+                self.store.compact(data)
+            except OSError as e:
+                logger.error(f"Error writing snapshot, keeping changes in the journal: {str(e)}")
+            else:
+                logger.info(f"Saved data with {len(data['projects'])} projects, {len(data['tasks'])} tasks, "
+                            f"and {len(data['sessions'])} sessions")
+                changes = [(op, payload) for kind, op, payload in batch[last + 1:] if kind == "change"]
+
+        if changes:
+            self.store.append_many(changes)
+            logger.info(f"Saved {len(changes)} change(s) to the journal")
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+
+DATE_RANGES = ["Today", "Yesterday", "Last 7 Days", "Last 30 Days", "All Time"]
+
+
+def date_range_for(date_filter, today):
+    """Return the (start_date, end_date) pair for a date dropdown option.
+
+    Either bound may be None, meaning the range is open on that side.
+    """
+    if date_filter == "Today":
+        return today, today
+    elif date_filter == "Yesterday":
+        yesterday = today - timedelta(days=1)
+        return yesterday, yesterday
+    elif date_filter == "Last 7 Days":
+        return today - timedelta(days=6), today
+    elif date_filter == "Last 30 Days":
+        return today - timedelta(days=29), today
+    # All Time has no date filter
+    return None, None
+
@@ -0,0 +1,166 @@
+from array import array
+from datetime import datetime, timedelta
+
+from .registry import Catalog
+
+
+# Naive local timestamps are stored as seconds since this moment, as floats
+# that keep the microseconds of the ISO strings in the data file. No timezone
+# conversion is involved, so int(seconds // DAY) is the local calendar day.
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DATE = EPOCH.date()
+DAY = 24 * 60 * 60
+
+
+def to_epoch(value):
+    """Convert a naive datetime or ISO string to epoch seconds, microseconds included"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) / timedelta(seconds=1)
+
+
+def from_epoch(seconds):
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def day_number(date):
+    """Return the day bucket for a calendar date"""
+    return (date - EPOCH_DATE).days
+
+
+class SessionStore:
+    """Columnar in-memory session storage.
+
+    A session is a row id into parallel typed arrays: start and end as epoch
+    seconds, duration in seconds, and the ids of its task and of the task's
+    project. Names come from the catalog, so renaming a project or task
+    never touches a row. Deleting a session clears its ``alive`` flag so
+    row ids stay stable for indexes; the gaps disappear the next time the
+    history is loaded. Sessions convert back to the pomodoro_data.json dict
+    schema with to_dict().
+
+    Rows are also listed per project and per task, so rows_where() on those
+    columns only visits the matching sessions.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog if catalog is not None else Catalog()
+        self.start = array('d')
+        self.end = array('d')
+        self.duration = array('d')
+        self.project = array('i')
+        self.task = array('i')
+        self.alive = bytearray()
+        self.live_count = 0
+        # Column -> {id: array of rows}
+        self.rows_by = {"project": {}, "task": {}}
+
+    @classmethod
+    def from_dicts(cls, sessions, catalog=None):
+        store = cls(catalog)
+        for session in sessions:
+            store.add(session)
+        return store
+
+    def __len__(self):
+        return self.live_count
+
+    def add(self, session):
+        """Append a session dict and return its row id"""
+        task_id = session["task_id"]
+        return self.add_record(to_epoch(session["start_time"]), to_epoch(session["end_time"]),
+                               self.catalog.task_project(task_id), task_id, session["duration_seconds"])
+
+    def add_record(self, start, end, project_id, task_id, duration):
+        row = len(self.alive)
+        self.start.append(start)
+        self.end.append(end)
+        self.duration.append(duration)
+        self.project.append(project_id)
+        self.task.append(task_id)
+        self.alive.append(1)
+        self.live_count += 1
+
+        rows_by = self.rows_by
+        try:
+            rows_by["project"][project_id].append(row)
+        except KeyError:
+            rows_by["project"][project_id] = array('i', (row,))
+        try:
+            rows_by["task"][task_id].append(row)
+        except KeyError:
+            rows_by["task"][task_id] = array('i', (row,))
+        return row
+
+    def remove(self, rows):
+        """Mark rows as deleted"""
+        for row in rows:
+            if self.alive[row]:
+                self.alive[row] = 0
+                self.live_count -= 1
+
+    def rows(self):
+        """Iterate over the ids of live rows in insertion order"""
+        alive = self.alive
+        return (row for row in range(len(alive)) if alive[row])
+
+    def rows_where(self, column, value_id):
+        """Return live rows whose project or task column equals value_id"""
+        alive = self.alive
+        index = self.rows_by.get(column)
+        if index is None:
+            values = getattr(self, column)
+            return [row for row, value in enumerate(values) if value == value_id and alive[row]]
+
+        rows = index.get(value_id)
+        if rows is None:
+            return []
+        live = [row for row in rows if alive[row]]
+        if len(live) < len(rows):
+            # Drop the deleted rows so they are not visited again
+            if live:
+                index[value_id] = array('i', live)
+            else:
+                del index[value_id]
+        return live
+
+    def project_name(self, row):
+        return self.catalog.project_name(self.project[row])
+
+    def task_name(self, row):
+        return self.catalog.task_name(self.task[row])
+
+    def task_key_name(self, row):
+        return self.catalog.task_key(self.task[row])
+
+    def start_datetime(self, row):
+        return from_epoch(self.start[row])
+
+    def end_datetime(self, row):
+        return from_epoch(self.end[row])
+
+    def to_dict(self, row):
+        """Return a row in the pomodoro_data.json session schema"""
+        return {
+            "start_time": self.start_datetime(row).isoformat(),
+            "end_time": self.end_datetime(row).isoformat(),
+            "task_id": self.task[row],
+            "duration_seconds": self.duration[row]
+        }
+
+    def to_dicts(self):
+        return [self.to_dict(row) for row in self.rows()]
+
+    def copy(self):
+        """Return a point-in-time copy that can be serialised on another thread.
+
+        The catalog is shared, names of deleted tasks stay in it.
+        """
+        snapshot = SessionStore(self.catalog)
+        for name in ("start", "end", "duration", "project", "task"):
+            setattr(snapshot, name, getattr(self, name)[:])
+        snapshot.alive = bytearray(self.alive)
+        # Not worth copying, rows_where() on a copy scans the columns instead
+        snapshot.rows_by = {}
+        snapshot.live_count = self.live_count
+        return snapshot
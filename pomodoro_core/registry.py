@@ -0,0 +1,247 @@
+from .typeahead import Typeahead
+
+
+class Registry:
+    """Ordered set with constant time membership, add and discard.
+
+    Iterates in insertion order like the plain lists it replaces; use
+    list(registry) wherever a real list is needed, such as combo values.
+    """
+
+    def __init__(self, names=()):
+        self.names = dict.fromkeys(names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self.names)!r})"
+
+    def add(self, name):
+        """Add name, returns False if it was already there"""
+        if name in self.names:
+            return False
+        self.names[name] = None
+        return True
+
+    def discard(self, name):
+        """Remove name, returns False if it was not there"""
+        if name not in self.names:
+            return False
+        del self.names[name]
+        return True
+
+
+def format_task_key(project, task):
+    """Return the "project: task" key the task combos show"""
+    return f"{project}: {task}"
+
+
+class Catalog:
+    """Projects and tasks with stable integer ids.
+
+    Sessions, the journal and the snapshot refer to tasks by id and a task
+    knows its project's id, so lookups, renames and deletes are dict
+    operations that never touch a session. The "project: task" keys shown
+    in the task combos are only built for display and kept in an index so
+    a selected key finds its task directly.
+
+    Names of deleted projects and tasks are kept until the next load, so an
+    export running on another thread can still name the rows it is writing.
+    """
+
+    def __init__(self):
+        # id -> name and id -> (project id, name), including deleted ones
+        self.project_names = {}
+        self.task_info = {}
+        # Live ids in the order they were added
+        self.projects = Registry()
+        self.tasks = Registry()
+        self.project_tasks = {}
+        # Reverse lookups for live entries
+        self.project_ids = {}
+        self.task_ids = {}
+        self.keys = {}
+        self.next_project_id = 1
+        self.next_task_id = 1
+        # Typeahead indexes, built on first use and then kept up to date
+        self.project_index = None
+        self.task_index = None
+
+    @classmethod
+    def from_header(cls, header):
+        """Build a catalog from the projects and tasks of a snapshot header"""
+        catalog = cls()
+        for project in header.get("projects", []):
+            catalog.add_project(project["name"], project["id"])
+        for task in header.get("tasks", []):
+            catalog.add_task(task["project_id"], task["name"], task["id"])
+        catalog.next_project_id = max(catalog.next_project_id, header.get("next_project_id", 1))
+        catalog.next_task_id = max(catalog.next_task_id, header.get("next_task_id", 1))
+        return catalog
+
+    def to_header(self):
+        """Return the projects and tasks as plain lists for a snapshot header"""
+        return {
+            "next_project_id": self.next_project_id,
+            "next_task_id": self.next_task_id,
+            "projects": [{"id": project_id, "name": self.project_names[project_id]}
+                         for project_id in self.projects],
+            "tasks": [{"id": task_id, "project_id": self.task_info[task_id][0], "name": self.task_info[task_id][1]}
+                      for task_id in self.tasks]
+        }
+
+    def add_project(self, name, project_id=None):
+        """Add a project and return its id, or None if the name is taken"""
+        if name in self.project_ids:
+            return None
+        if project_id is None:
+            project_id = self.next_project_id
+        self.next_project_id = max(self.next_project_id, project_id + 1)
+        self.project_names[project_id] = name
+        self.project_ids[name] = project_id
+        self.projects.add(project_id)
+        self.project_tasks[project_id] = Registry()
+        if self.project_index is not None:
+            self.project_index.add(project_id, name)
+        return project_id
+
+    def rename_project(self, project_id, name):
+        """Rename a live project, returns False if it is unknown or the name is taken"""
+        if project_id not in self.projects or name in self.project_ids:
+            return False
+        for task_id in self.project_tasks[project_id]:
+            del self.keys[self.task_key(task_id)]
+        del self.project_ids[self.project_names[project_id]]
+        self.project_names[project_id] = name
+        self.project_ids[name] = project_id
+        for task_id in self.project_tasks[project_id]:
+            self.keys[self.task_key(task_id)] = task_id
+            self.index_task(task_id)
+        if self.project_index is not None:
+            self.project_index.add(project_id, name)
+        return True
+
+    def remove_project(self, project_id):
+        """Remove a project with its tasks and return the removed task ids"""
+        if not self.projects.discard(project_id):
+            return []
+        task_ids = list(self.project_tasks[project_id])
+        for task_id in task_ids:
+            self.remove_task(task_id)
+        del self.project_tasks[project_id]
+        del self.project_ids[self.project_names[project_id]]
+        if self.project_index is not None:
+            self.project_index.discard(project_id)
+        return task_ids
+
+    def add_task(self, project_id, name, task_id=None):
+        """Add a task to a live project and return its id, or None if it already has one by that name"""
+        if project_id not in self.projects or (project_id, name) in self.task_ids:
+            return None
+        if task_id is None:
+            task_id = self.next_task_id
+        self.next_task_id = max(self.next_task_id, task_id + 1)
+        self.task_info[task_id] = (project_id, name)
+        self.task_ids[(project_id, name)] = task_id
+        self.tasks.add(task_id)
+        self.project_tasks[project_id].add(task_id)
+        self.keys[self.task_key(task_id)] = task_id
+        self.index_task(task_id)
+        return task_id
+
+    def rename_task(self, task_id, name):
+        """Rename a live task, returns False if it is unknown or its project has a task by that name"""
+        if task_id not in self.tasks:
+            return False
+        project_id, old_name = self.task_info[task_id]
+        if (project_id, name) in self.task_ids:
+            return False
+        self.forget_key(task_id)
+        del self.task_ids[(project_id, old_name)]
+        self.task_info[task_id] = (project_id, name)
+        self.task_ids[(project_id, name)] = task_id
+        self.keys[self.task_key(task_id)] = task_id
+        self.index_task(task_id)
+        return True
+
+    def remove_task(self, task_id):
+        """Remove a task, returns False if it was not there"""
+        if not self.tasks.discard(task_id):
+            return False
+        project_id, name = self.task_info[task_id]
+        self.forget_key(task_id)
+        del self.task_ids[(project_id, name)]
+        self.project_tasks[project_id].discard(task_id)
+        if self.task_index is not None:
+            self.task_index.discard(task_id)
+        return True
+
+    def forget_key(self, task_id):
+        key = self.task_key(task_id)
+        # Two tasks can format to the same key, e.g. "a" / "b: c" and "a: b" / "c"
+        if self.keys.get(key) == task_id:
+            del self.keys[key]
+
+    def index_task(self, task_id):
+        if self.task_index is not None:
+            self.task_index.add(task_id, self.task_key(task_id))
+
+    def project_typeahead(self):
+        """Return the Typeahead over live project names"""
+        if self.project_index is None:
+            self.project_index = Typeahead((project_id, self.project_names[project_id])
+                                           for project_id in self.projects)
+        return self.project_index
+
+    def task_typeahead(self):
+        """Return the Typeahead over live "project: task" keys"""
+        if self.task_index is None:
+            self.task_index = Typeahead((task_id, self.task_key(task_id)) for task_id in self.tasks)
+        return self.task_index
+
+    def project_id(self, name):
+        return self.project_ids.get(name)
+
+    def task_id(self, project_id, name):
+        return self.task_ids.get((project_id, name))
+
+    def find_task(self, text, project_id=None):
+        """Return the id of the task a combo entry names, or None.
+
+        text is either a task name within the project or a "project: task"
+        key as listed in the task combo.
+        """
+        if project_id is not None:
+            task_id = self.task_ids.get((project_id, text))
+            if task_id is not None:
+                return task_id
+        return self.keys.get(text)
+
+    def project_name(self, project_id):
+        return self.project_names[project_id]
+
+    def task_name(self, task_id):
+        return self.task_info[task_id][1]
+
+    def task_project(self, task_id):
+        return self.task_info[task_id][0]
+
+    def task_key(self, task_id):
+        project_id, name = self.task_info[task_id]
+        return format_task_key(self.project_names[project_id], name)
+
+    def project_list(self):
+        """Return the live project names in the order they were added"""
+        return [self.project_names[project_id] for project_id in self.projects]
+
+    def task_keys(self, project_id=None):
+        """Return the task keys of one project, or of every project, in the order they were added"""
+        task_ids = self.tasks if project_id is None else self.project_tasks.get(project_id, ())
+        return [self.task_key(task_id) for task_id in task_ids]
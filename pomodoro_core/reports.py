@@ -0,0 +1,129 @@
+import csv
+import json
+from datetime import timedelta
+
+from .records import EPOCH_DATE
+
+
+SUMMARY_FIELDS = ['Section', 'Name', 'Sessions', 'Duration (min)']
+
+
+def report_range(report_type, today):
+    """Return the (start_date, end_date) covered by a named report"""
+    if report_type == "daily":
+        return today, today
+    if report_type == "weekly":
+        return today - timedelta(days=today.weekday()), today
+    if report_type == "all_time":
+        return None, None
+    raise ValueError(f"Unknown report type: {report_type}")
+
+
+def longest_streak(days):
+    """Return (first day, last day, sessions, seconds) of the longest run of consecutive days.
+
+    days is a list of (day number, seconds, count) sorted by day, as returned
+    by SessionRollups.by_day(). Returns None when there are no days.
+    """
+    best = None
+    run = None
+    previous = None
+    for day, seconds, count in days:
+        if previous is not None and day == previous + 1:
+            run[1] = day
+            run[2] += count
+            run[3] += seconds
+        else:
+            run = [day, day, count, seconds]
+        # Ties keep the earliest streak
+        if best is None or run[1] - run[0] > best[1] - best[0]:
+            best = list(run)
+        previous = day
+    return tuple(best) if best else None
+
+
+def build_summary(rollups, start_date=None, end_date=None):
+    """Aggregate the sessions in a date range into a JSON-ready summary dict.
+
+    Everything is read from the rollup cells, so the cost depends on the
+    number of days with sessions rather than the number of sessions.
+    """
+    total_seconds, session_count = rollups.totals(start_date, end_date)
+    days = rollups.by_day(start_date, end_date)
+
+    def breakdown(cells, name):
+        items = sorted(cells.items(), key=lambda item: (-item[1][0], item[0]))
+        return [{name: key, "seconds": seconds, "sessions": count} for key, (seconds, count) in items]
+
+    streak = longest_streak(days)
+    if streak is not None:
+        first, last, count, seconds = streak
+        streak = {
+            "start_date": (EPOCH_DATE + timedelta(days=first)).isoformat(),
+            "end_date": (EPOCH_DATE + timedelta(days=last)).isoformat(),
+            "days": last - first + 1,
+            "sessions": count,
+            "seconds": seconds
+        }
+
+    return {
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "total_seconds": total_seconds,
+        "session_count": session_count,
+        "average_session_seconds": total_seconds / session_count if session_count else 0.0,
+        "active_days": len(days),
+        "longest_streak": streak,
+        "projects": breakdown(rollups.by_project(start_date, end_date), "project"),
+        "tasks": breakdown(rollups.by_task_key(start_date, end_date), "task_key"),
+        "days": [
+            {"date": (EPOCH_DATE + timedelta(days=day)).isoformat(), "seconds": seconds, "sessions": count}
+            for day, seconds, count in days
+        ]
+    }
+
+
+def write_summary_json(summary, filename):
+    with open(filename, 'w') as file:
+        dump_summary_json(summary, file)
+
+
+def dump_summary_json(summary, file):
+    json.dump(summary, file, indent=4)
+    file.write("\n")
+
+
+def write_summary_csv(summary, filename):
+    with open(filename, 'w', newline='') as csvfile:
+        dump_summary_csv(summary, csvfile)
+
+
+def dump_summary_csv(summary, csvfile):
+    """Write a summary as one CSV table with a Section column per breakdown"""
+    def minutes(seconds):
+        return f"{seconds / 60:.1f}"
+
+    writer = csv.writer(csvfile)
+    writer.writerow(SUMMARY_FIELDS)
+    writer.writerow(('Total', '', summary["session_count"], minutes(summary["total_seconds"])))
+    writer.writerow(('Average Session', '', '', minutes(summary["average_session_seconds"])))
+
+    streak = summary["longest_streak"]
+    if streak is not None:
+        writer.writerow(('Longest Streak', f"{streak['days']} days ({streak['start_date']} to {streak['end_date']})",
+                         streak["sessions"], minutes(streak["seconds"])))
+
+    for project in summary["projects"]:
+        writer.writerow(('Project', project["project"], project["sessions"], minutes(project["seconds"])))
+    for task in summary["tasks"]:
+        writer.writerow(('Task', task["task_key"], task["sessions"], minutes(task["seconds"])))
+    for day in summary["days"]:
+        writer.writerow(('Day', day["date"], day["sessions"], minutes(day["seconds"])))
+
+
+def write_summary(summary, filename):
+    """Write a summary as JSON or CSV depending on the file extension"""
+    if filename.lower().endswith(".json"):
+        write_summary_json(summary, filename)
+    else:
+        write_summary_csv(summary, filename)
@@ -0,0 +1,252 @@
+import bisect
+from datetime import datetime
+
+from .records import DAY, day_number, to_epoch
+
+
+# A use counts half as much after this many days, see frecency()
+HALF_LIFE_DAYS = 14
+
+
+class SessionRollups:
+    """Running totals of seconds and session counts.
+
+    Every day with sessions has a [seconds, count] cell for the whole day and
+    one per project and per task recorded that day, and the same cells are
+    kept for all time. A range total only reads the day cells inside the
+    range, so "Last 30 Days" is at most 30 additions however long the history.
+    Project and task cells are keyed by id and only named when a breakdown
+    is returned, so a rename never invalidates them.
+
+    The totals are built lazily: load_data() just calls invalidate() and the
+    first query after that does one pass over the store.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self.stale = True
+
+    def invalidate(self, store=None):
+        """Drop the totals so the next query rebuilds them from store"""
+        if store is not None:
+            self.store = store
+        self.stale = True
+
+    def ensure(self):
+        if self.stale:
+            self.build()
+
+    def build(self):
+        self.days = {}
+        self.day_projects = {}
+        self.day_tasks = {}
+        self.total = [0.0, 0]
+        self.projects = {}
+        self.tasks = {}
+        self.day_keys = []
+        self.stale = False
+
+        if self.store is None:
+            return
+
+        # One pass over the columns, without the per-row cleanup apply() does
+        store = self.store
+        columns = zip(store.alive, store.start, store.duration, store.project, store.task)
+        for alive, start, seconds, project, task in columns:
+            if not alive:
+                continue
+            day = int(start // DAY)
+            cell = self.days.get(day)
+            if cell is None:
+                cell = self.days[day] = [0.0, 0]
+                self.day_projects[day] = {}
+                self.day_tasks[day] = {}
+            cell[0] += seconds
+            cell[1] += 1
+            for cells, key in ((self.day_projects[day], project), (self.day_tasks[day], task),
+                               (self.projects, project), (self.tasks, task)):
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [seconds, 1]
+                else:
+                    cell[0] += seconds
+                    cell[1] += 1
+            self.total[0] += seconds
+            self.total[1] += 1
+        self.day_keys = sorted(self.days)
+
+    def add(self, row):
+        """Count a newly recorded row"""
+        if self.stale:
+            return
+        day = int(self.store.start[row] // DAY)
+        if day not in self.days:
+            bisect.insort(self.day_keys, day)
+        self.apply(row, 1)
+
+    def remove(self, rows):
+        """Subtract deleted rows, the store columns must still hold their values"""
+        if self.stale:
+            return
+        for row in rows:
+            self.apply(row, -1)
+
+    def apply(self, row, sign):
+        store = self.store
+        day = int(store.start[row] // DAY)
+        seconds = store.duration[row] * sign
+        project = store.project[row]
+        task = store.task[row]
+
+        self.bump(self.days, day, seconds, sign)
+        self.bump(self.day_projects.setdefault(day, {}), project, seconds, sign)
+        self.bump(self.day_tasks.setdefault(day, {}), task, seconds, sign)
+        self.bump(self.projects, project, seconds, sign)
+        self.bump(self.tasks, task, seconds, sign)
+        self.total[0] += seconds
+        self.total[1] += sign
+
+        if day not in self.days:
+            # The last session of the day is gone
+            del self.day_projects[day]
+            del self.day_tasks[day]
+            index = bisect.bisect_left(self.day_keys, day)
+            if index < len(self.day_keys) and self.day_keys[index] == day:
+                del self.day_keys[index]
+
+    @staticmethod
+    def bump(cells, key, seconds, count):
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [0.0, 0]
+        cell[0] += seconds
+        cell[1] += count
+        if cell[1] <= 0:
+            del cells[key]
+
+    def days_between(self, start_date=None, end_date=None):
+        """Return the sorted day keys inside the date range"""
+        self.ensure()
+        low = 0 if start_date is None else bisect.bisect_left(self.day_keys, day_number(start_date))
+        high = len(self.day_keys) if end_date is None else bisect.bisect_right(self.day_keys, day_number(end_date))
+        return self.day_keys[low:high]
+
+    def totals(self, start_date=None, end_date=None):
+        """Return (seconds, session count) for the date range"""
+        self.ensure()
+        if start_date is None and end_date is None:
+            return self.total[0], self.total[1]
+
+        seconds, count = 0.0, 0
+        days = self.days
+        for day in self.days_between(start_date, end_date):
+            seconds += days[day][0]
+            count += days[day][1]
+        return seconds, count
+
+    def by_day(self, start_date=None, end_date=None):
+        """Return a list of (day number, seconds, count), oldest first"""
+        self.ensure()
+        days = self.days
+        return [(day, days[day][0], days[day][1]) for day in self.days_between(start_date, end_date)]
+
+    def by_project(self, start_date=None, end_date=None):
+        """Return {project: (seconds, count)} for the date range"""
+        self.ensure()
+        return self.breakdown(self.projects, self.day_projects, self.store.catalog.project_name,
+                              start_date, end_date)
+
+    def by_task_key(self, start_date=None, end_date=None):
+        """Return {task_key: (seconds, count)} for the date range"""
+        self.ensure()
+        return self.breakdown(self.tasks, self.day_tasks, self.store.catalog.task_key,
+                              start_date, end_date)
+
+    def breakdown(self, all_time, per_day, name, start_date, end_date):
+        if start_date is None and end_date is None:
+            return {name(key): (cell[0], cell[1]) for key, cell in all_time.items()}
+
+        merged = {}
+        for day in self.days_between(start_date, end_date):
+            for key, (seconds, count) in per_day[day].items():
+                cell = merged.get(key)
+                if cell is None:
+                    merged[key] = [seconds, count]
+                else:
+                    cell[0] += seconds
+                    cell[1] += count
+        return {name(key): (cell[0], cell[1]) for key, cell in merged.items()}
+
+
+def frecency(count, last_start, now):
+    """Score a project or task by how often and how recently it was used"""
+    if not count:
+        return 0.0
+    age_days = max(0, now - last_start) / DAY
+    return count * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+
+class UsageStats:
+    """Session count and latest start per task and per project.
+
+    Built lazily with one pass over the store like SessionRollups, then
+    kept up to date as sessions are added. Deleting sessions only happens
+    together with their task or project, whose entries then no longer
+    matter, so nothing is subtracted.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self.stale = True
+        self.tasks = {}
+        self.projects = {}
+
+    def invalidate(self, store=None):
+        if store is not None:
+            self.store = store
+        self.stale = True
+
+    def ensure(self):
+        if not self.stale:
+            return
+        self.tasks = {}
+        self.projects = {}
+        self.stale = False
+        if self.store is None:
+            return
+        store = self.store
+        for alive, start, project, task in zip(store.alive, store.start, store.project, store.task):
+            if alive:
+                self.count(self.tasks, task, start)
+                self.count(self.projects, project, start)
+
+    def add(self, row):
+        """Count a newly recorded row"""
+        if self.stale:
+            return
+        store = self.store
+        self.count(self.tasks, store.task[row], store.start[row])
+        self.count(self.projects, store.project[row], store.start[row])
+
+    @staticmethod
+    def count(cells, key, start):
+        cell = cells.get(key)
+        if cell is None:
+            cells[key] = [1, start]
+        else:
+            cell[0] += 1
+            if start > cell[1]:
+                cell[1] = start
+
+    def scores(self, cells, now=None):
+        """Return {id: frecency} for the task or project cells"""
+        self.ensure()
+        if now is None:
+            now = to_epoch(datetime.now())
+        return {key: frecency(count, last_start, now) for key, (count, last_start) in cells.items()}
+
+    def task_scores(self, now=None):
+        return self.scores(self.tasks, now)
+
+    def project_scores(self, now=None):
+        return self.scores(self.projects, now)
@@ -0,0 +1,162 @@
+import json
+import re
+from json.encoder import encode_basestring_ascii
+
+
+# Version 1 snapshots have no "version" key and name a session's project,
+# task and "project: task" key in every session; version 2 gives projects
+# and tasks integer ids and sessions only carry their task_id
+SCHEMA_VERSION = 2
+
+# Header keys come before "sessions" in a snapshot, see write_snapshot()
+HEADER_KEYS = ("version", "journal_seq", "next_project_id", "next_task_id", "projects", "tasks")
+
+# Whitespace, optionally with the separators between items
+SKIP = {"": re.compile(r"\s*"), ",": re.compile(r"[\s,]*")}
+
+
+class SnapshotReader:
+    """Incrementally decode a pomodoro_data.json snapshot.
+
+    header() decodes the top-level values up to the "sessions" array,
+    sessions() then yields its items one at a time and finally decodes
+    whatever follows the array (early snapshots put "tasks" there). Only
+    one chunk of text plus the item being decoded is held at any time, so
+    a caller that keeps each session in a compact form never holds the
+    raw file or a list of session dicts.
+    """
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.at_end = False
+        self.values = {}
+        self.has_sessions = False
+
+    def fill(self):
+        """Read the next chunk, dropping the text that has already been decoded"""
+        more = self.file.read(self.chunk_size)
+        self.at_end = len(more) < self.chunk_size
+        self.text = self.text[self.pos:] + more
+        self.pos = 0
+
+    def peek(self, separators=""):
+        """Skip whitespace and separators and return the next character, "" at the end"""
+        skip = SKIP[separators]
+        while True:
+            text = self.text
+            pos = skip.match(text, self.pos).end()
+            self.pos = pos
+            if pos < len(text) or self.at_end:
+                return text[pos:pos + 1]
+            self.fill()
+
+    def decode(self):
+        # raw_decode() does not skip leading whitespace
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+                # A value running up to the end of the chunk may be a number cut short
+                if end < len(self.text) or self.at_end:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.at_end:
+                    raise
+            self.fill()
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.text, self.pos)
+
+    def read_values(self):
+        """Decode "key": value pairs into values, returns True when stopped at "sessions" """
+        while True:
+            char = self.peek(",")
+            if char == "}":
+                self.pos += 1
+                return False
+            if char != '"':
+                raise self.error("Expecting property name")
+            key = self.decode()
+            if self.peek() != ":":
+                raise self.error("Expecting ':' delimiter")
+            self.pos += 1
+            if key == "sessions" and not self.has_sessions:
+                return True
+            self.values[key] = self.decode()
+
+    def header(self):
+        """Decode the values before the sessions, returns False if the file is not a JSON object"""
+        if self.peek() != "{":
+            return False
+        self.pos += 1
+        self.has_sessions = self.read_values()
+        return True
+
+    def sessions(self):
+        """Yield the session dicts one at a time, then decode the values after them"""
+        if not self.has_sessions:
+            return
+        if self.peek() != "[":
+            raise self.error("Expecting a list of sessions")
+        self.pos += 1
+        while True:
+            char = self.peek(",")
+            if char == "]":
+                self.pos += 1
+                break
+            if char == "":
+                raise self.error("Unterminated list of sessions")
+            yield self.decode()
+        self.read_values()
+
+
+def read_header(data_file, chunk_size=1 << 14):
+    """Return the top-level values that precede "sessions" in a snapshot.
+
+    Only the start of the file is read and decoded, so this stays cheap no
+    matter how many sessions follow. Returns None if the file is not an
+    object or has no "sessions" key.
+    """
+    with open(data_file, "r") as file:
+        reader = SnapshotReader(file, chunk_size)
+        if not reader.header() or not reader.has_sessions:
+            return None
+        return reader.values
+
+
+def indented(value, level):
+    return json.dumps(value, indent=4).replace("\n", "\n" + "    " * level)
+
+
+def format_session(session):
+    """Format a flat session dict the way indented(session, 2) would, without the slow indenting encoder"""
+    if not session:
+        return "{}"
+    fields = ",\n            ".join(
+        f"{encode_basestring_ascii(key)}: "
+        f"{encode_basestring_ascii(value) if isinstance(value, str) else json.dumps(value)}"
+        for key, value in session.items()
+    )
+    return "{\n            " + fields + "\n        }"
+
+
+def write_snapshot(file, header, sessions):
+    """Write a snapshot one session at a time, laid out like json.dump(..., indent=4).
+
+    header is written first in its own key order, so HEADER_KEYS should lead
+    it; sessions is any iterable of session dicts.
+    """
+    file.write("{\n")
+    for key, value in header.items():
+        file.write(f"    {json.dumps(key)}: {indented(value, 1)},\n")
+    file.write('    "sessions": [')
+    empty = True
+    for session in sessions:
+        file.write(("\n" if empty else ",\n") + "        " + format_session(session))
+        empty = False
+    file.write("]\n}" if empty else "\n    ]\n}")
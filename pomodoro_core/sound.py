@@ -0,0 +1,146 @@
+import logging
+import os
+import queue
+import sys
+import threading
+
+
+logger = logging.getLogger('pomodoro.sound')
+
+SAMPLE_RATE = 22050
+
+# Seconds close() waits for the sound being played
+CLOSE_TIMEOUT = 3
+
+# (frequency in Hz, duration in ms) pairs, a frequency of 0 is silence
+TONE_SEQUENCES = {
+    "pomodoro_complete": [(1000, 500), (0, 200), (1000, 500), (0, 200), (1000, 500)],
+    "break_complete": [(800, 800), (0, 300), (800, 800)],
+    "skip_break": [(700, 300), (0, 100), (900, 300)],
+    "default": [(600, 500)],
+}
+
+# Command line players tried in order on platforms without winsound
+PLAYERS = ["paplay", "aplay", "afplay"]
+
+
+def render_wav(sequence, sample_rate=SAMPLE_RATE, volume=0.5):
+    """Render a tone sequence to 16-bit mono WAV bytes"""
+    # Only needed on the sound thread, so kept off the startup path
+    import array
+    import io
+    import math
+    import wave
+
+    samples = array.array('h')
+    amplitude = int(32767 * volume)
+    fade = int(sample_rate * 0.005)
+
+    for frequency, duration_ms in sequence:
+        count = int(sample_rate * duration_ms / 1000)
+        if frequency == 0:
+            samples.extend([0] * count)
+            continue
+        step = 2 * math.pi * frequency / sample_rate
+        for i in range(count):
+            # Short linear fade in and out so tones don't click
+            envelope = min(1.0, i / fade, (count - i) / fade) if fade else 1.0
+            samples.append(int(amplitude * envelope * math.sin(step * i)))
+
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class SoundPlayer:
+    """Play notification sounds on a background thread.
+
+    play() only puts the request on a queue, so neither the UI nor the timer
+    ever waits for audio. The thread starts with the first sound, and each
+    tone sequence is rendered to WAV once and cached; on Windows it is
+    played from memory with winsound, elsewhere the cached file is handed
+    to the first available command line player.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.rendered = {}
+        self.files = {}
+        self.cache_dir = None
+        self.player = None
+        self.thread = None
+
+    def play(self, sound_type):
+        """Queue a sound for playback and return immediately"""
+        # Started on first use so rendering never competes with startup
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="pomodoro-sound", daemon=True)
+            self.thread.start()
+        self.queue.put(sound_type)
+
+    def close(self):
+        """Stop the playback thread and delete the cached WAV files"""
+        if self.thread is not None:
+            self.queue.put(None)
+            # Let a sound that is still playing finish with its file
+            self.thread.join(timeout=CLOSE_TIMEOUT)
+        if self.cache_dir is not None:
+            import shutil
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self.cache_dir = None
+            self.files = {}
+
+    def run(self):
+        # Each sound is rendered the first time it is played, off the UI thread
+        if sys.platform != 'win32':
+            import shutil
+            self.player = next((shutil.which(name) for name in PLAYERS if shutil.which(name)), None)
+
+        while True:
+            sound_type = self.queue.get()
+            if sound_type is None:
+                break
+            try:
+                self.play_now(sound_type)
+            except Exception as e:
+                logger.error(f"Error playing sound: {str(e)}")
+
+    def render(self, sound_type):
+        if sound_type not in TONE_SEQUENCES:
+            sound_type = "default"
+        if sound_type not in self.rendered:
+            self.rendered[sound_type] = render_wav(TONE_SEQUENCES[sound_type])
+        return self.rendered[sound_type]
+
+    def wav_file(self, sound_type):
+        """Return the path of a cached WAV file for the sound, writing it on first use"""
+        if sound_type not in self.files:
+            if self.cache_dir is None:
+                import tempfile
+                self.cache_dir = tempfile.mkdtemp(prefix="pomodoro-sounds-")
+            path = os.path.join(self.cache_dir, f"{sound_type}.wav")
+            with open(path, "wb") as file:
+                file.write(self.render(sound_type))
+            self.files[sound_type] = path
+        return self.files[sound_type]
+
+    def play_now(self, sound_type):
+        if sys.platform == 'win32':
+            import winsound
+            winsound.PlaySound(self.render(sound_type), winsound.SND_MEMORY)
+        elif self.player:
+            import subprocess
+            subprocess.run([self.player, self.wav_file(sound_type)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        else:
+            logger.info(f"Sound '{sound_type}' requested but no audio player was found")
+            return
+
+        logger.info(f"Played sound: {sound_type}")
@@ -0,0 +1,281 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from .journal import JournalStore, empty_data
+from .metrics import METRICS
+from .records import SessionStore, to_epoch
+from .registry import Catalog
+from .upgrade import V1Upgrade
+
+
+logger = logging.getLogger('pomodoro.sqlite')
+
+SESSION_COLUMNS = ("start_time", "end_time", "task_id", "duration_seconds")
+
+# Stored in PRAGMA user_version; databases created before it have 0 there
+SCHEMA_VERSION = 2
+
+# AUTOINCREMENT keeps the highest id ever used in sqlite_sequence, so ids of
+# deleted projects and tasks are never handed out again
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (project_id, name)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    duration_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_task ON sessions (task_id, start_time);
+"""
+
+
+def seed_sequences(conn, header):
+    """Continue AUTOINCREMENT from the header's next ids.
+
+    Inserting explicit ids only moves sqlite_sequence up to the highest id
+    inserted, which would hand out again the ids of the last projects and
+    tasks deleted before the copy.
+    """
+    for table, key in (("projects", "next_project_id"), ("tasks", "next_task_id")):
+        last_id = header[key] - 1
+        if conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (last_id, table)).rowcount:
+            continue
+        if last_id > 0:
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, last_id))
+
+
+# Sessions with their names, for queries that hand rows to an export
+NAMED_SESSIONS = "sessions JOIN tasks ON tasks.id = sessions.task_id JOIN projects ON projects.id = tasks.project_id"
+
+
+class SQLiteStore:
+    """SQLite-backed store with the same load/append/compact API as JournalStore.
+
+    Sessions are indexed on start time and task id. ISO timestamps sort
+    lexicographically, so a date range query is an index range scan over
+    ``start_time``. Databases from before projects and tasks had ids are
+    upgraded in place when they are opened.
+
+    The connection may be shared between the UI and the persistence worker,
+    so every statement runs under a lock.
+    """
+
+    supports_queries = True
+    compact_every = None
+
+    def __init__(self, db_file):
+        self.data_file = db_file
+        self.journal_entries = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"{db_file} uses data format version {version}, "
+                             f"this version only reads up to {SCHEMA_VERSION}")
+        if version < SCHEMA_VERSION and self.has_v1_tables():
+            self.upgrade_v1()
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def has_v1_tables(self):
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")]
+        return "task_key" in columns
+
+    def upgrade_v1(self):
+        """Rebuild version 1 tables, which name tasks by "project: task" key, with ids"""
+        conn = self.conn
+        data = empty_data()
+        upgrade = V1Upgrade(data["catalog"], data["sessions"])
+        upgrade.read_header({
+            "projects": [row[0] for row in conn.execute("SELECT name FROM projects ORDER BY id")],
+            "tasks": [row[0] for row in conn.execute("SELECT task_key FROM tasks ORDER BY id")]
+        })
+        cursor = conn.execute("SELECT start_time, end_time, project, task, task_key, duration_seconds "
+                              "FROM sessions ORDER BY id")
+        sessions = [(start_time, end_time, upgrade.task(task_key, project, task), duration_seconds)
+                    for start_time, end_time, project, task, task_key, duration_seconds in cursor]
+
+        header = data["catalog"].to_header()
+        conn.execute("BEGIN")
+        try:
+            for table in ("sessions", "tasks", "projects"):
+                conn.execute(f"DROP TABLE {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.executemany("INSERT INTO projects (id, name) VALUES (?, ?)",
+                             ((project["id"], project["name"]) for project in header["projects"]))
+            conn.executemany("INSERT INTO tasks (id, project_id, name) VALUES (?, ?, ?)",
+                             ((task["id"], task["project_id"], task["name"]) for task in header["tasks"]))
+            conn.executemany(f"INSERT INTO sessions ({', '.join(SESSION_COLUMNS)}) VALUES (?, ?, ?, ?)", sessions)
+            seed_sequences(conn, header)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"Converted {self.data_file} to data format version {SCHEMA_VERSION}")
+
+    def load(self, since=None):
+        """Return the database as a data document like JournalStore.load().
+
+        data["sessions"] is a SessionStore filled straight from the cursor.
+        Sessions that started before the date since are skipped; they stay
+        in the database.
+        """
+        catalog = self.load_header()
+        sessions = SessionStore(catalog)
+        where, params = self.range_clause(start_date=since)
+        with self.lock:
+            cursor = self.conn.execute(
+                "SELECT start_time, end_time, project_id, task_id, duration_seconds "
+                f"FROM sessions JOIN tasks ON tasks.id = sessions.task_id{where} ORDER BY start_time",
+                params
+            )
+            for start_time, end_time, project_id, task_id, duration_seconds in cursor:
+                sessions.add_record(to_epoch(start_time), to_epoch(end_time), project_id, task_id,
+                                    duration_seconds)
+        return {"catalog": catalog, "sessions": sessions}
+
+    def load_header(self):
+        """Return a Catalog of the projects and tasks without reading the sessions"""
+        with self.lock:
+            conn = self.conn
+            next_ids = dict(conn.execute("SELECT name, seq + 1 FROM sqlite_sequence"))
+            return Catalog.from_header({
+                "next_project_id": next_ids.get("projects", 1),
+                "next_task_id": next_ids.get("tasks", 1),
+                "projects": [{"id": project_id, "name": name}
+                             for project_id, name in conn.execute("SELECT id, name FROM projects ORDER BY id")],
+                "tasks": [{"id": task_id, "project_id": project_id, "name": name}
+                          for task_id, project_id, name in
+                          conn.execute("SELECT id, project_id, name FROM tasks ORDER BY id")]
+            })
+
+    def append(self, op, **payload):
+        """Apply a single mutation in its own transaction"""
+        self.append_many([(op, payload)])
+
+    def append_many(self, changes):
+        """Apply a batch of (op, payload) mutations in one transaction"""
+        with METRICS.timed("save_journal"), self.lock, self.conn:
+            for op, payload in changes:
+                self.apply(op, payload)
+        METRICS.increment("journal_entries", len(changes))
+
+    def apply(self, op, payload):
+        if op == "add_project":
+            self.conn.execute("INSERT OR IGNORE INTO projects (id, name) VALUES (?, ?)",
+                              (payload["project_id"], payload["name"]))
+        elif op == "rename_project":
+            self.conn.execute("UPDATE projects SET name = ? WHERE id = ?", (payload["name"], payload["project_id"]))
+        elif op == "delete_project":
+            project_id = payload["project_id"]
+            self.conn.execute("DELETE FROM sessions WHERE task_id IN (SELECT id FROM tasks WHERE project_id = ?)",
+                              (project_id,))
+            self.conn.execute("DELETE FROM tasks WHERE project_id = ?", (project_id,))
+            self.conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        elif op == "add_task":
+            self.conn.execute("INSERT OR IGNORE INTO tasks (id, project_id, name) VALUES (?, ?, ?)",
+                              (payload["task_id"], payload["project_id"], payload["name"]))
+        elif op == "rename_task":
+            self.conn.execute("UPDATE tasks SET name = ? WHERE id = ?", (payload["name"], payload["task_id"]))
+        elif op == "delete_task":
+            task_id = payload["task_id"]
+            self.conn.execute("DELETE FROM sessions WHERE task_id = ?", (task_id,))
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        elif op == "add_session":
+            self.insert_sessions([payload["session"]])
+        else:
+            logger.warning(f"Ignoring unknown change: {op}")
+
+    def insert_sessions(self, sessions):
+        self.conn.executemany(
+            f"INSERT INTO sessions ({', '.join(SESSION_COLUMNS)}) VALUES ({', '.join('?' * len(SESSION_COLUMNS))})",
+            ([session[column] for column in SESSION_COLUMNS] for session in sessions)
+        )
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self, data):
+        # Every change is committed as it happens, there is no snapshot to write
+        pass
+
+    def range_clause(self, start_date=None, end_date=None):
+        """Build the WHERE clause and parameters for a session range query"""
+        clauses = []
+        params = []
+        if start_date is not None:
+            clauses.append("start_time >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            clauses.append("start_time < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
+
+    def iter_sessions(self, start_date=None, end_date=None):
+        """Stream (start, end, project, task, duration_seconds) tuples, oldest first.
+
+        Uses its own connection so a long export never holds the shared lock
+        and can run on a background thread.
+        """
+        where, params = self.range_clause(start_date, end_date)
+        conn = sqlite3.connect(self.data_file)
+        try:
+            cursor = conn.execute(
+                "SELECT start_time, end_time, projects.name, tasks.name, duration_seconds "
+                f"FROM {NAMED_SESSIONS}{where} ORDER BY start_time",
+                params
+            )
+            for start_time, end_time, project, task, duration_seconds in cursor:
+                yield (datetime.fromisoformat(start_time), datetime.fromisoformat(end_time),
+                       project, task, duration_seconds)
+        finally:
+            conn.close()
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(json_file, db_file):
+    """Copy an existing pomodoro_data.json (and its journal) into a new database"""
+    if os.path.exists(db_file):
+        raise FileExistsError(f"{db_file} already exists")
+
+    data = JournalStore(json_file).load()
+    header = data["catalog"].to_header()
+    sessions = data["sessions"]
+    store = SQLiteStore(db_file)
+    try:
+        with store.conn:
+            store.conn.executemany("INSERT INTO projects (id, name) VALUES (?, ?)",
+                                   ((project["id"], project["name"]) for project in header["projects"]))
+            store.conn.executemany("INSERT INTO tasks (id, project_id, name) VALUES (?, ?, ?)",
+                                   ((task["id"], task["project_id"], task["name"]) for task in header["tasks"]))
+            store.insert_sessions(sessions.to_dict(row) for row in sessions.rows())
+            seed_sequences(store.conn, header)
+    finally:
+        store.close()
+
+    logger.info(f"Migrated {len(header['projects'])} projects, {len(header['tasks'])} tasks and "
+                f"{len(sessions)} sessions from {json_file} to {db_file}")
+    return len(sessions)
@@ -0,0 +1,152 @@
+"""Startup timing for the Pomodoro Timer frontends.
+
+Frontends import StartupProfile first thing and mark each phase of
+startup; the summary goes to the application log. Setting
+POMODORO_STARTUP_REPORT to a file name also appends a JSON record per
+launch there, and POMODORO_STARTUP_EXIT=1 closes the window as soon as it
+is interactive so launches can be timed from a script.
+
+Usage: python -m pomodoro_core.startup [pomodoro_timer_pretty.py] [--runs 5]
+
+prints the slowest imports of a frontend and, when a display is available,
+the time to an interactive window averaged over several launches.
+"""
+
+import os
+import sys
+import time
+
+
+# Taken when the frontend first imports this module, before tkinter
+IMPORTED_AT = time.perf_counter()
+
+REPORT_ENV = "POMODORO_STARTUP_REPORT"
+EXIT_ENV = "POMODORO_STARTUP_EXIT"
+
+
+class StartupProfile:
+    """Named checkpoints measured from when the frontend started importing"""
+
+    def __init__(self, started=None):
+        self.started = IMPORTED_AT if started is None else started
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def phases(self):
+        """Return [(name, milliseconds spent since the previous mark)]"""
+        phases = []
+        previous = self.started
+        for name, at in self.marks:
+            phases.append((name, (at - previous) * 1000))
+            previous = at
+        return phases
+
+    def total_ms(self):
+        if not self.marks:
+            return 0.0
+        return (self.marks[-1][1] - self.started) * 1000
+
+    def summary(self):
+        parts = [f"{name} {ms:.0f} ms" for name, ms in self.phases()]
+        return f"{', '.join(parts)} (total {self.total_ms():.0f} ms)"
+
+    def record(self, frontend, filename=None):
+        """Append this launch to the report file named by POMODORO_STARTUP_REPORT, if set"""
+        filename = filename or os.environ.get(REPORT_ENV)
+        if not filename:
+            return
+        import json
+        entry = {
+            "frontend": frontend,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "phases": {name: round(ms, 1) for name, ms in self.phases()},
+            "total_ms": round(self.total_ms(), 1)
+        }
+        with open(filename, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+
+
+def exit_after_startup():
+    return os.environ.get(EXIT_ENV) == "1"
+
+
+# The report tool below is never imported by the frontends themselves, so
+# its heavier modules are imported where they are used.
+
+def import_times(module, directory, top=15):
+    """Return the total import time of module in ms and its slowest imports"""
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=directory)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(fields[1]) / 1000
+        except ValueError:
+            # The header line
+            continue
+        rows.append((cumulative, fields[2].rstrip()))
+
+    total = next((ms for ms, name in rows if name.strip() == module), 0.0)
+    rows.sort(reverse=True)
+    return total, rows[:top]
+
+
+def time_launches(script, runs):
+    """Launch the frontend runs times and return the recorded startup entries"""
+    import json
+    import subprocess
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        report = os.path.join(directory, "startup.jsonl")
+        env = dict(os.environ, **{REPORT_ENV: report, EXIT_ENV: "1"})
+        for _ in range(runs):
+            subprocess.run([sys.executable, script], env=env, cwd=directory,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+        if not os.path.exists(report):
+            return []
+        with open(report) as file:
+            return [json.loads(line) for line in file]
+
+
+def main(argv):
+    script = "pomodoro_timer_pretty.py"
+    runs = 5
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == "--runs":
+            runs = int(args.pop(0))
+        else:
+            script = arg
+    script = os.path.abspath(script)
+    module = os.path.splitext(os.path.basename(script))[0]
+
+    total, slowest = import_times(module, os.path.dirname(script))
+    print(f"Importing {module}: {total:.1f} ms")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    entries = time_launches(script, runs)
+    if not entries:
+        print("Could not launch the window (no display?), skipped time to interactive")
+        return 0
+
+    print(f"Time to interactive over {len(entries)} launches:")
+    for name in entries[0]["phases"]:
+        average = sum(entry["phases"][name] for entry in entries) / len(entries)
+        print(f"  {name:<15} {average:8.1f} ms")
+    average = sum(entry["total_ms"] for entry in entries) / len(entries)
+    print(f"  {'total':<15} {average:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
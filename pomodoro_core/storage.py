@@ -0,0 +1,17 @@
+import os
+
+from .journal import JournalStore
+
+
+def open_store(data_file):
+    """Open the store for data_file.
+
+    If pomodoro_data.json has been migrated to a pomodoro_data.db alongside
+    it, the SQLite store is used, otherwise the JSON snapshot and journal.
+    """
+    db_file = os.path.splitext(data_file)[0] + ".db"
+    if os.path.exists(db_file):
+        # Only pull in sqlite3 for databases that have actually been migrated
+        from .sqlite_store import SQLiteStore
+        return SQLiteStore(db_file)
+    return JournalStore(data_file)
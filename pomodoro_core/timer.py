@@ -0,0 +1,147 @@
+import math
+import time
+
+
+class TimerEngine:
+    """Countdown measured against a time.monotonic() deadline.
+
+    The remaining time is derived from the clock on every wake instead of
+    being decremented per tick, so late wakeups (a blocking dialog, a slow
+    repaint) never accumulate into drift. The frontend asks how long to
+    sleep until the display next changes and checks expired() on each wake.
+    """
+
+    def __init__(self, seconds=0, clock=time.monotonic):
+        self.clock = clock
+        self.reset(seconds)
+
+    def reset(self, seconds):
+        """Stop the countdown and set the time remaining"""
+        self.deadline = None
+        self.stopped_remaining = float(seconds)
+        self.fired = False
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def start(self):
+        if self.deadline is None:
+            self.deadline = self.clock() + self.stopped_remaining
+
+    def pause(self):
+        if self.deadline is not None:
+            self.stopped_remaining = max(0.0, self.deadline - self.clock())
+            self.deadline = None
+
+    def remaining_exact(self):
+        if self.deadline is None:
+            return self.stopped_remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def remaining(self):
+        """Whole seconds left, rounded up so the display reaches 00:00 at the deadline"""
+        return int(math.ceil(self.remaining_exact()))
+
+    def expired(self):
+        """Return True once, on the first check at or after the deadline"""
+        if self.fired or self.deadline is None or self.remaining_exact() > 0:
+            return False
+        self.fired = True
+        return True
+
+    def ms_until_next_second(self):
+        """Milliseconds until the remaining time crosses the next whole second"""
+        remaining = self.remaining_exact()
+        fraction = remaining - math.floor(remaining)
+        if fraction == 0:
+            return 1000 if remaining > 0 else 1
+        return max(1, int(math.ceil(fraction * 1000)))
+
+
+POMODORO = "Pomodoro"
+SHORT_BREAK = "Short Break"
+LONG_BREAK = "Long Break"
+
+
+class PomodoroCycle:
+    """The Pomodoro / Short Break / Long Break state machine.
+
+    Holds the length of each mode and the count of completed pomodoros,
+    and drives a TimerEngine for the current mode. When a countdown runs
+    out the frontend calls advance() to move to the next mode; recording
+    the session and telling the user stay with the caller.
+    """
+
+    def __init__(self, pomodoro_time=25 * 60, short_break_time=5 * 60, long_break_time=15 * 60,
+                 long_break_every=4, clock=time.monotonic):
+        self.durations = {
+            POMODORO: pomodoro_time,
+            SHORT_BREAK: short_break_time,
+            LONG_BREAK: long_break_time
+        }
+        self.long_break_every = long_break_every
+        self.mode = POMODORO
+        self.completed_pomodoros = 0
+        self.engine = TimerEngine(pomodoro_time, clock)
+
+    @property
+    def running(self):
+        return self.engine.running
+
+    @property
+    def on_break(self):
+        return self.mode != POMODORO
+
+    def duration(self):
+        """Full length of the current mode in seconds"""
+        return self.durations[self.mode]
+
+    def remaining(self):
+        return self.engine.remaining()
+
+    def progress(self):
+        """Fraction of the current mode that has elapsed, from 0.0 to 1.0"""
+        duration = self.duration()
+        if duration <= 0:
+            return 1.0
+        return min(1.0, max(0.0, 1.0 - self.engine.remaining_exact() / duration))
+
+    def start(self):
+        self.engine.start()
+
+    def pause(self):
+        self.engine.pause()
+
+    def reset(self):
+        """Stop and rewind the countdown for the current mode"""
+        self.engine.reset(self.duration())
+
+    def expired(self):
+        """Return True once when the running countdown reaches zero"""
+        return self.engine.expired()
+
+    def ms_until_next_second(self):
+        return self.engine.ms_until_next_second()
+
+    def advance(self):
+        """Move on to the mode that follows the current one and return the mode that finished"""
+        finished = self.mode
+        if finished == POMODORO:
+            self.completed_pomodoros += 1
+            if self.completed_pomodoros % self.long_break_every == 0:
+                self.mode = LONG_BREAK
+            else:
+                self.mode = SHORT_BREAK
+        else:
+            self.mode = POMODORO
+        self.reset()
+        return finished
+
+    def skip_break(self):
+        """Abandon a break and get ready for the next pomodoro, returns False outside breaks"""
+        if not self.on_break:
+            return False
+        self.mode = POMODORO
+        self.reset()
+        return True
@@ -0,0 +1,425 @@
+import logging
+import os
+import threading
+from datetime import date, timedelta
+
+from .export import iter_store_rows
+from .index import SessionIndex
+from .lock import DataLock
+from .metrics import METRICS
+from .persistence import PersistenceWorker
+from .records import SessionStore
+from .registry import Catalog
+from .reports import build_summary
+from .rollups import SessionRollups, UsageStats
+from .storage import open_store
+
+
+logger = logging.getLogger('pomodoro.tracker')
+
+# Sessions shorter than this are not worth recording
+MIN_SESSION_SECONDS = 60
+
+RETENTION_ENV = "POMODORO_RETENTION_DAYS"
+
+
+def retention_days_setting():
+    """Return the retention horizon set in POMODORO_RETENTION_DAYS, or None to load everything"""
+    value = os.environ.get(RETENTION_ENV, "").strip()
+    if not value:
+        return None
+    try:
+        days = int(value)
+    except ValueError:
+        logger.warning(f"Ignoring {RETENTION_ENV}={value!r}, expected a number of days")
+        return None
+    return days if days > 0 else None
+
+
+class TaskTracker:
+    """Projects, tasks and recorded sessions, independent of any UI.
+
+    Owns the store, the session columns, the day index and the rollups, and
+    keeps them in step on every change. Frontends call these methods and
+    only update their widgets from what they return.
+
+    With background=True (the GUIs) writes go through a PersistenceWorker;
+    otherwise (the command line) every change is written before returning.
+
+    The GUIs call load_header() and load_in_background() instead of load(),
+    so the window never waits for the history. Until poll_loaded() has
+    returned True, every method that reads sessions or records a change
+    first waits for the load to finish.
+
+    With retention_days set, sessions that started more than that many days
+    ago are skipped while loading. They stay in the data file but are not
+    shown, counted or exported.
+
+    Frontends and commands that change the data call lock_data_file()
+    first, so two programs never write the data file at the same time;
+    close() gives the lock up again.
+
+    Projects are named by the user; tasks are found with task_id() or
+    find_task() and then passed around by id, since two projects can have
+    a task of the same name.
+    """
+
+    def __init__(self, data_file="pomodoro_data.json", background=True, retention_days=None):
+        self.store = open_store(data_file)
+        self.data_lock = DataLock(data_file)
+        self.background = background
+        self.retention_days = retention_days
+        self.persistence = None
+        self.catalog = Catalog()
+        self.sessions = SessionStore(self.catalog)
+        self.index = SessionIndex()
+        self.rollups = SessionRollups()
+        self.usage = UsageStats()
+        self.loader = None
+        self.loaded = None
+        self.load_error = None
+
+    @property
+    def data_file(self):
+        return self.store.data_file
+
+    @property
+    def loading(self):
+        return self.loader is not None
+
+    def lock_data_file(self):
+        """Lock the data file for this program, raises DataFileLocked while another one has it"""
+        self.data_lock.acquire()
+
+    def load(self):
+        """Load the history and start accepting changes"""
+        self.finish_loading(self.read_history())
+
+    def load_header(self):
+        """Load only the projects and tasks, returns False if the store can't read them on their own"""
+        with METRICS.timed("load_header"):
+            catalog = self.store.load_header()
+        if catalog is None:
+            return False
+        self.catalog = catalog
+        return True
+
+    def load_in_background(self):
+        """Start reading the history on a background thread, see poll_loaded()"""
+        self.loader = threading.Thread(target=self.run_loader, name="pomodoro-load", daemon=True)
+        self.loader.start()
+
+    def run_loader(self):
+        try:
+            self.loaded = self.read_history()
+        except Exception as e:
+            logger.error(f"Error loading data: {str(e)}")
+            self.load_error = e
+
+    def poll_loaded(self):
+        """Apply a finished background load, returns False while it is still running"""
+        if self.loader is not None and self.loader.is_alive():
+            return False
+        self.ensure_loaded()
+        return True
+
+    def ensure_loaded(self):
+        """Wait for a background load and apply it, re-raising its error if it failed"""
+        if self.loader is None:
+            return
+        self.loader.join()
+        if self.load_error is not None:
+            # Stay unloaded so nothing is ever written over the unread history
+            raise self.load_error
+        history = self.loaded
+        self.loader = None
+        self.loaded = None
+        self.finish_loading(history)
+
+    def read_history(self):
+        """Read and index the stored history; touches nothing but the store, so it can run on any thread"""
+        since = None
+        if self.retention_days:
+            since = date.today() - timedelta(days=self.retention_days)
+        with METRICS.timed("load"):
+            # Snapshot plus any journalled changes made since it was written, streamed into the store
+            data = self.store.load(since=since)
+            catalog = data["catalog"]
+            sessions = data["sessions"]
+            # Built here so the first keystroke in a combo does not pay for them
+            catalog.project_typeahead()
+            catalog.task_typeahead()
+            usage = UsageStats(sessions)
+            usage.ensure()
+            index = SessionIndex(sessions)
+        return catalog, sessions, index, usage
+
+    def finish_loading(self, history):
+        self.catalog, self.sessions, self.index, self.usage = history
+        self.rollups.invalidate(self.sessions)
+        logger.info(f"Loaded {len(self.catalog.projects)} projects and {len(self.catalog.tasks)} tasks")
+        logger.info(f"Loaded {len(self.sessions)} previous sessions")
+
+        if self.background:
+            # Writes from here on happen on a background thread
+            self.persistence = PersistenceWorker(self.store)
+        # Also true right after older data has been converted
+        if self.store.needs_compaction():
+            self.save()
+
+    def snapshot(self):
+        """Return a copy of the data that is safe to serialise on another thread"""
+        # Copies, so the persistence thread never sees a list being modified
+        return dict(self.catalog.to_header(), sessions=self.sessions.copy())
+
+    def save(self):
+        """Write a full snapshot of the data file, in the background if enabled"""
+        self.ensure_loaded()
+        if self.persistence is not None:
+            self.persistence.compact(self.snapshot())
+        else:
+            self.store.compact(self.snapshot())
+
+    def journal_change(self, op, **payload):
+        """Record a single change in the journal instead of rewriting the data file"""
+        self.journal_changes([(op, payload)])
+
+    def journal_changes(self, changes):
+        """Record a batch of (op, payload) changes"""
+        if self.persistence is not None:
+            for op, payload in changes:
+                self.persistence.submit(op, **payload)
+            if self.persistence.needs_compaction():
+                self.save()
+        else:
+            self.store.append_many(changes)
+            if self.store.needs_compaction():
+                self.save()
+
+    def sync(self):
+        """Fold every pending change into the data file and wait for the write"""
+        self.ensure_loaded()
+        if self.persistence is None:
+            if self.store.journal_entries:
+                self.save()
+            return
+        if self.persistence.changes_since_snapshot:
+            self.save()
+        self.persistence.flush()
+
+    def close(self):
+        """Flush pending writes, stop the persistence thread and unlock the data file"""
+        if self.loader is not None:
+            # Changes wait for the load, so there is nothing to write yet
+            self.loader.join()
+        elif self.persistence is not None:
+            self.persistence.close()
+        self.data_lock.release()
+
+    def project_names(self):
+        """Return the project names in the order they were added"""
+        return self.catalog.project_list()
+
+    def has_project(self, project):
+        return self.catalog.project_id(project) is not None
+
+    def task_keys(self, project=None):
+        """Return the "project: task" keys of a project's tasks, or of every task"""
+        if project is None:
+            return self.catalog.task_keys()
+        project_id = self.catalog.project_id(project)
+        return [] if project_id is None else self.catalog.task_keys(project_id)
+
+    def task_id(self, project, task):
+        """Return the id of a project's task by name, or None"""
+        project_id = self.catalog.project_id(project)
+        return None if project_id is None else self.catalog.task_id(project_id, task)
+
+    def find_task(self, text, project=None):
+        """Return the id of the task a task combo entry refers to, or None.
+
+        text is a task name within project or a "project: task" key.
+        """
+        return self.catalog.find_task(text, self.catalog.project_id(project))
+
+    def typed_task_name(self, text, project):
+        """Return the task name a task combo entry gives within project.
+
+        The combo lists "project: task" keys, so a leading "project: " is
+        dropped rather than becoming part of a new task's name.
+        """
+        prefix = f"{project}: "
+        name = text[len(prefix):].strip() if text.startswith(prefix) else ""
+        return name or text
+
+    def task_key(self, task_id):
+        return self.catalog.task_key(task_id)
+
+    def complete_projects(self, text):
+        """Return the project names matching typed text, most used first.
+
+        Never waits for a background load; until it is done nothing is
+        ranked by use.
+        """
+        scores = None if self.loading else self.usage.project_scores()
+        return self.catalog.project_typeahead().search(text, scores)
+
+    def complete_tasks(self, text, project=None):
+        """Return the task keys matching typed text, only the project's if it is known, most used first"""
+        project_id = self.catalog.project_id(project)
+        allowed = None if project_id is None else self.catalog.project_tasks[project_id]
+        scores = None if self.loading else self.usage.task_scores()
+        return self.catalog.task_typeahead().search(text, scores, allowed)
+
+    def add_project(self, project):
+        """Add a project, returns False if it is empty or already known"""
+        self.ensure_loaded()
+        if not project:
+            return False
+        project_id = self.catalog.add_project(project)
+        if project_id is None:
+            return False
+        self.journal_change("add_project", project_id=project_id, name=project)
+        return True
+
+    def rename_project(self, project, new_name):
+        """Rename a project, returns False if it is unknown or new_name is empty or taken"""
+        self.ensure_loaded()
+        project_id = self.catalog.project_id(project)
+        if project_id is None or not new_name or not self.catalog.rename_project(project_id, new_name):
+            return False
+        self.journal_change("rename_project", project_id=project_id, name=new_name)
+        return True
+
+    def delete_project(self, project):
+        """Delete a project with its tasks and sessions, returns the removed session rows"""
+        self.ensure_loaded()
+        project_id = self.catalog.project_id(project)
+        if project_id is None:
+            return []
+
+        # Remove task sessions associated with the project
+        removed = self.sessions.rows_where("project", project_id)
+        self.remove_rows(removed)
+
+        # Remove tasks associated with the project
+        task_ids = self.catalog.remove_project(project_id)
+        self.journal_change("delete_project", project_id=project_id, task_ids=task_ids)
+        return removed
+
+    def add_task(self, project, task):
+        """Add a task to a project, adding the project too if needed.
+
+        Returns False if either name is empty or the project already has
+        the task.
+        """
+        self.ensure_loaded()
+        if not project or not task:
+            return False
+        changes = []
+        project_id = self.catalog.project_id(project)
+        if project_id is None:
+            project_id = self.catalog.add_project(project)
+            changes.append(("add_project", {"project_id": project_id, "name": project}))
+        task_id = self.catalog.add_task(project_id, task)
+        if task_id is not None:
+            changes.append(("add_task", {"task_id": task_id, "project_id": project_id, "name": task}))
+        if changes:
+            self.journal_changes(changes)
+        return task_id is not None
+
+    def rename_task(self, task_id, new_name):
+        """Rename a task, returns False if it is unknown or its project already has new_name"""
+        self.ensure_loaded()
+        if not new_name or not self.catalog.rename_task(task_id, new_name):
+            return False
+        self.journal_change("rename_task", task_id=task_id, name=new_name)
+        return True
+
+    def delete_task(self, task_id):
+        """Delete a task and its sessions, returns the removed session rows"""
+        self.ensure_loaded()
+        if not self.catalog.remove_task(task_id):
+            return []
+
+        # Remove task sessions associated with the task
+        removed = self.sessions.rows_where("task", task_id)
+        self.remove_rows(removed)
+        self.journal_change("delete_task", task_id=task_id)
+        return removed
+
+    def remove_rows(self, rows):
+        self.sessions.remove(rows)
+        self.index.remove(rows)
+        self.rollups.remove(rows)
+
+    def record_session(self, project, task, start_time, end_time):
+        """Record time spent on a task and return its row, or None if it was too short.
+
+        task is a task name or "project: task" key as for find_task(); a
+        task that does not exist yet is added to the project.
+        """
+        duration = (end_time - start_time).total_seconds()
+
+        # Only record sessions that are at least 1 minute long
+        if duration < MIN_SESSION_SECONDS:
+            return None
+
+        self.ensure_loaded()
+        task_id = self.find_task(task, project)
+        if task_id is None:
+            task = self.typed_task_name(task, project)
+            self.add_task(project, task)
+            task_id = self.task_id(project, task)
+
+        return self.add_session({
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "task_id": task_id,
+            "duration_seconds": duration
+        })
+
+    def add_session(self, session):
+        """Add a session dict in the data file schema, see SessionStore.to_dict(), and return its row"""
+        return self.add_sessions([session])[0]
+
+    def add_sessions(self, sessions):
+        """Add several session dicts with one journal write and return their rows"""
+        self.ensure_loaded()
+        rows = []
+        for session in sessions:
+            row = self.sessions.add(session)
+            self.index.add(row)
+            self.rollups.add(row)
+            self.usage.add(row)
+            rows.append(row)
+        self.journal_changes([("add_session", {"session": session}) for session in sessions])
+        return rows
+
+    def rows_between(self, start_date=None, end_date=None, newest_first=False):
+        """Return the session rows that started within the date range"""
+        self.ensure_loaded()
+        return self.index.between(start_date, end_date, newest_first=newest_first)
+
+    def totals(self, start_date=None, end_date=None):
+        """Return (seconds, session count) for the date range"""
+        self.ensure_loaded()
+        return self.rollups.totals(start_date, end_date)
+
+    def summary(self, start_date=None, end_date=None):
+        self.ensure_loaded()
+        return build_summary(self.rollups, start_date, end_date)
+
+    def count_sessions(self, start_date=None, end_date=None):
+        """Return how many sessions started within the date range"""
+        self.ensure_loaded()
+        return self.index.count_between(start_date, end_date)
+
+    def iter_sessions(self, start_date=None, end_date=None):
+        """Lazily yield session tuples in the date range, oldest first.
+
+        Read from memory, which already has the changes still queued for
+        the store, so this never waits for the persistence thread.
+        """
+        self.ensure_loaded()
+        return iter_store_rows(self.sessions, self.index, start_date, end_date)
@@ -0,0 +1,121 @@
+import bisect
+import re
+
+
+# Typed queries list at most this many matches
+COMPLETION_LIMIT = 30
+
+WORD = re.compile(r"\w+")
+
+
+class Typeahead:
+    """Incremental, ranked completion over a set of names.
+
+    Every word start of every name is kept in one sorted list, so a typed
+    prefix of the name or of any word in it ("ema" for "Work: Email") is a
+    bisect plus a walk over the matches. Only when that finds fewer than
+    the limit are the names scanned for the typed characters in order
+    ("wkeml"), and a query that extends the previous one only rescans the
+    names the previous one matched.
+    """
+
+    def __init__(self, entries=()):
+        self.texts = {}
+        self.folded = {}
+        self.starts = []
+        for entry_id, text in entries:
+            self.texts[entry_id] = text
+            self.folded[entry_id] = folded = text.casefold()
+            self.starts.extend(self.word_starts(entry_id, folded))
+        self.starts.sort()
+        self.keys = [suffix for suffix, _, _ in self.starts]
+        self.last_query = None
+        self.last_allowed = None
+        self.last_fuzzy = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    @staticmethod
+    def word_starts(entry_id, folded):
+        return [(folded[word.start():], word.start(), entry_id) for word in WORD.finditer(folded)]
+
+    def add(self, entry_id, text):
+        """Add or replace the name of entry_id"""
+        self.discard(entry_id)
+        self.texts[entry_id] = text
+        self.folded[entry_id] = folded = text.casefold()
+        for start in self.word_starts(entry_id, folded):
+            index = bisect.bisect_left(self.starts, start)
+            self.starts.insert(index, start)
+            self.keys.insert(index, start[0])
+        self.last_query = None
+
+    def discard(self, entry_id):
+        folded = self.folded.pop(entry_id, None)
+        if folded is None:
+            return
+        del self.texts[entry_id]
+        for start in self.word_starts(entry_id, folded):
+            index = bisect.bisect_left(self.starts, start)
+            del self.starts[index]
+            del self.keys[index]
+        self.last_query = None
+
+    def prefix_matches(self, query):
+        """Return {id: 0 for a name prefix, 1 for a word prefix} for the folded query"""
+        matches = {}
+        starts = self.starts
+        index = bisect.bisect_left(self.keys, query)
+        while index < len(starts) and starts[index][0].startswith(query):
+            _, position, entry_id = starts[index]
+            tier = 0 if position == 0 else 1
+            if matches.get(entry_id, 2) > tier:
+                matches[entry_id] = tier
+            index += 1
+        return matches
+
+    def fuzzy_matches(self, query, allowed=None):
+        """Return the ids whose name contains the query's characters in order"""
+        if (self.last_query is not None and query.startswith(self.last_query)
+                and allowed is self.last_allowed):
+            candidates = self.last_fuzzy
+        elif allowed is not None and len(allowed) < len(self.folded):
+            candidates = [entry_id for entry_id in allowed if entry_id in self.folded]
+        else:
+            candidates = self.folded
+        # "a[^b]*b[^c]*c" never backtracks, unlike "a.*?b.*?c"
+        pattern = re.compile(re.escape(query[0]) + "".join(
+            f"[^{re.escape(char)}]*{re.escape(char)}" for char in query[1:]))
+        folded = self.folded
+        matches = [entry_id for entry_id in candidates if pattern.search(folded[entry_id])]
+        self.last_query = query
+        self.last_allowed = allowed
+        self.last_fuzzy = matches
+        return matches
+
+    def search(self, text, scores=None, allowed=None, limit=COMPLETION_LIMIT):
+        """Return the names matching text, best first.
+
+        Name prefixes come before word prefixes, which come before fuzzy
+        matches; within each, higher scores (see UsageStats) come first.
+        allowed restricts the result to those ids. An empty text lists
+        every name by score, without a limit.
+        """
+        scores = scores or {}
+        query = text.strip().casefold()
+        if not query:
+            ids = [entry_id for entry_id in self.texts if allowed is None or entry_id in allowed]
+            ids.sort(key=lambda entry_id: (-scores.get(entry_id, 0.0), self.folded[entry_id]))
+            return [self.texts[entry_id] for entry_id in ids]
+
+        tiers = {entry_id: tier for entry_id, tier in self.prefix_matches(query).items()
+                 if allowed is None or entry_id in allowed}
+        if len(tiers) < limit:
+            for entry_id in self.fuzzy_matches(query, allowed):
+                if entry_id not in tiers and (allowed is None or entry_id in allowed):
+                    tiers[entry_id] = 2
+
+        ranked = sorted(tiers, key=lambda entry_id: (tiers[entry_id], -scores.get(entry_id, 0.0),
+                                                     self.folded[entry_id]))
+        return [self.texts[entry_id] for entry_id in ranked[:limit]]
@@ -0,0 +1,105 @@
+import logging
+
+from .records import to_epoch
+
+
+logger = logging.getLogger('pomodoro.upgrade')
+
+
+def is_v1_entry(entry):
+    """Return True for a journal entry written before projects and tasks had ids"""
+    payload = entry.get("session", entry)
+    return "project_id" not in payload and "task_id" not in payload
+
+
+class V1Upgrade:
+    """Convert version 1 data, where a task is a "project: task" string, while it is read.
+
+    Projects and tasks get ids in a Catalog as they are first seen and
+    sessions go into a SessionStore by task id. A session names its project
+    and task, so those are taken as given. A task that is only listed by key
+    is split after the longest known project name followed by ":", the same
+    prefix the old startswith(f"{project}:") ownership test matched.
+    """
+
+    def __init__(self, catalog, sessions):
+        self.catalog = catalog
+        self.sessions = sessions
+
+    def project(self, name):
+        """Return the id of the named project, adding it if needed"""
+        project_id = self.catalog.project_id(name)
+        if project_id is None:
+            project_id = self.catalog.add_project(name)
+        return project_id
+
+    def split_key(self, task_key):
+        """Return (project, task) for a "project: task" key"""
+        project = None
+        for name in self.catalog.project_ids:
+            if task_key.startswith(f"{name}:") and (project is None or len(name) > len(project)):
+                project = name
+        if project is None:
+            project, separator, task = task_key.partition(":")
+            if not separator:
+                return "", task_key
+        else:
+            task = task_key[len(project) + 1:]
+        return project, task[1:] if task.startswith(" ") else task
+
+    def task(self, task_key, project=None, task=None):
+        """Return the id of the task with this key, adding it (and its project) if needed"""
+        task_id = self.catalog.keys.get(task_key)
+        if task_id is not None:
+            return task_id
+        if project is None:
+            project, task = self.split_key(task_key)
+        project_id = self.project(project)
+        task_id = self.catalog.task_id(project_id, task)
+        if task_id is None:
+            task_id = self.catalog.add_task(project_id, task)
+        return task_id
+
+    def read_header(self, values):
+        """Add the projects and tasks listed in a version 1 snapshot"""
+        for project in values.get("projects", []):
+            self.project(project)
+        for task_key in values.get("tasks", []):
+            self.task(task_key)
+
+    def add_session(self, session):
+        task_id = self.task(session["task_key"], session["project"], session["task"])
+        return self.sessions.add_record(to_epoch(session["start_time"]), to_epoch(session["end_time"]),
+                                        self.catalog.task_project(task_id), task_id,
+                                        session["duration_seconds"])
+
+    def remove_task(self, task_id):
+        self.sessions.remove(self.sessions.rows_where("task", task_id))
+        self.catalog.remove_task(task_id)
+
+    def apply(self, entry):
+        """Apply a version 1 journal entry"""
+        op = entry.get("op")
+
+        if op == "add_project":
+            self.project(entry["project"])
+        elif op == "delete_project":
+            project = entry["project"]
+            project_id = self.catalog.project_id(project)
+            if project_id is not None:
+                self.sessions.remove(self.sessions.rows_where("project", project_id))
+                self.catalog.remove_project(project_id)
+            # Version 1 also dropped tasks filed under another project with this prefix
+            for task_key, task_id in list(self.catalog.keys.items()):
+                if task_key.startswith(f"{project}:"):
+                    self.remove_task(task_id)
+        elif op == "add_task":
+            self.task(entry["task_key"])
+        elif op == "delete_task":
+            task_id = self.catalog.keys.get(entry["task_key"])
+            if task_id is not None:
+                self.remove_task(task_id)
+        elif op == "add_session":
+            self.add_session(entry["session"])
+        else:
+            logger.warning(f"Ignoring unknown journal entry: {op}")
@@ -0,0 +1,355 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class PagedSessionTree:
+    """Fill a Treeview a page at a time as the user scrolls.
+
+    The full list of session row ids is kept in memory but only the rows
+    the user has scrolled to, plus one page of buffer, are ever inserted
+    into the Treeview. When the visible window gets near the last
+    materialised row the next page is inserted.
+
+    Rows are ordered newest first by sort_key. Stripes are counted from the
+    oldest row, so inserting a new session at the top leaves every existing
+    tag as is.
+    """
+
+    def __init__(self, tree, scrollbar, format_row, sort_key, page_size=100, striped=False, prefetch=0.9):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.sort_key = sort_key
+        self.page_size = page_size
+        self.striped = striped
+        self.prefetch = prefetch
+        self.rows = []
+        self.item_ids = []
+        self.loaded = 0
+        self.load_pending = False
+
+        self.tree.configure(yscrollcommand=self.on_scroll)
+
+    def set_rows(self, rows):
+        """Replace the rows being shown and materialise the first page"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.rows = rows
+        self.item_ids = []
+        self.loaded = 0
+        self.load_next_page()
+
+    def row_tags(self, i):
+        if not self.striped:
+            return ()
+        return ("even" if (len(self.rows) - 1 - i) % 2 == 0 else "odd",)
+
+    def load_next_page(self):
+        self.load_pending = False
+        end = min(self.loaded + self.page_size, len(self.rows))
+        for i in range(self.loaded, end):
+            item_id = self.tree.insert("", tk.END, values=self.format_row(self.rows[i]), tags=self.row_tags(i))
+            self.item_ids.append(item_id)
+        self.loaded = end
+
+    def insert_row(self, row):
+        """Insert a single row at its sorted position without rebuilding the tree"""
+        key = self.sort_key(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sort_key(self.rows[middle]) > key:
+                low = middle + 1
+            else:
+                high = middle
+        position = low
+
+        self.rows.insert(position, row)
+
+        # Rows past the materialised window will be inserted by a later page
+        if position > self.loaded or (position == self.loaded and self.loaded < len(self.rows) - 1):
+            return
+
+        item_id = self.tree.insert("", position, values=self.format_row(row), tags=self.row_tags(position))
+        self.item_ids.insert(position, item_id)
+        self.loaded += 1
+
+        # Only the newer rows above the insert changed stripe parity
+        self.restripe(0, position)
+
+    def remove_rows(self, rows):
+        """Remove the given rows and return those that were in the view"""
+        doomed = set(rows)
+        if not doomed:
+            return []
+
+        removed = []
+        kept_rows = []
+        kept_ids = []
+        for i, row in enumerate(self.rows):
+            if row in doomed:
+                removed.append(row)
+                if i < self.loaded:
+                    self.tree.delete(self.item_ids[i])
+            else:
+                kept_rows.append(row)
+                if i < self.loaded:
+                    kept_ids.append(self.item_ids[i])
+
+        if removed:
+            self.rows = kept_rows
+            self.item_ids = kept_ids
+            self.loaded = len(kept_ids)
+            self.restripe(0, self.loaded)
+        return removed
+
+    def restripe(self, start, end):
+        if not self.striped:
+            return
+        for i in range(start, end):
+            self.tree.item(self.item_ids[i], tags=self.row_tags(i))
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+
+        # Fetch the next page once the view nears the last materialised row
+        if float(last) >= self.prefetch and self.loaded < len(self.rows) and not self.load_pending:
+            self.load_pending = True
+            self.tree.after_idle(self.load_next_page)
+
+
+class TypeaheadCombo:
+    """Narrow a Combobox's dropdown to the completions of what has been typed.
+
+    complete(text) returns the values to offer. It runs on every key that
+    changes the text, so it has to answer within a few milliseconds; the
+    tracker's complete_projects() and complete_tasks() do. Keys that leave
+    the text alone, like the arrows used to pick an entry, are ignored.
+    """
+
+    def __init__(self, combo, complete):
+        self.combo = combo
+        self.complete = complete
+        self.text = None
+        combo.bind('<KeyRelease>', self.on_key, add='+')
+
+    def on_key(self, event=None):
+        text = self.combo.get()
+        if text == self.text:
+            return
+        self.text = text
+        self.combo['values'] = self.complete(text)
+
+
+class ProgressRing:
+    """A circular progress indicator drawn on its own Canvas.
+
+    The track and the arc are created once; set() only changes the arc's
+    extent and colour with itemconfig, and skips the call when the arc
+    would move by less than min_step degrees, so the canvas never grows
+    and each update costs the same all day.
+
+    animate() follows a progress function while the timer runs. Frames
+    are at most fps a second, and no more often than the arc can visibly
+    move: a 25 minute Pomodoro redraws every couple of seconds, a short
+    countdown up to fps times a second.
+    """
+
+    def __init__(self, parent, size=90, width=8, color="#ff6347", track="#dddddd", background="#ffffff",
+                 fps=30, min_step=0.5):
+        self.fps = fps
+        self.min_step = min_step
+        self.canvas = tk.Canvas(parent, width=size, height=size, background=background,
+                                highlightthickness=0, borderwidth=0)
+        inset = width / 2 + 1
+        bounds = (inset, inset, size - inset, size - inset)
+        self.canvas.create_oval(*bounds, outline=track, width=width)
+        self.arc = self.canvas.create_arc(*bounds, start=90, extent=0, style="arc", outline=color,
+                                          width=width, state="hidden")
+        self.extent = 0.0
+        self.color = color
+        self.progress = None
+        self.interval = int(1000 / fps)
+        self.job = None
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+    def set(self, progress, color=None):
+        """Show progress from 0.0 to 1.0, optionally in a new colour"""
+        extent = -360.0 * min(1.0, max(0.0, progress))
+        changes = {}
+        if color is not None and color != self.color:
+            self.color = changes["outline"] = color
+        # Always land exactly on empty and full, otherwise wait for a visible step
+        if extent != self.extent and (abs(extent - self.extent) >= self.min_step or extent in (0.0, -360.0)):
+            if extent == 0.0:
+                changes["state"] = "hidden"
+            elif self.extent == 0.0:
+                changes["state"] = "normal"
+            self.extent = changes["extent"] = extent
+        if changes:
+            self.canvas.itemconfig(self.arc, **changes)
+
+    def animate(self, progress, duration):
+        """Redraw from progress() until stop(); duration is the seconds it takes to go from 0 to 1"""
+        self.progress = progress
+        # Time for the arc to move min_step degrees, but no faster than fps
+        self.interval = max(int(1000 / self.fps), int(duration * self.min_step / 360 * 1000))
+        if self.job is None:
+            self.frame()
+
+    def frame(self):
+        self.set(self.progress())
+        self.job = self.canvas.after(self.interval, self.frame)
+
+    def stop(self):
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+            self.job = None
+
+
+class NotificationArea:
+    """Short-lived messages stacked in a corner of the window.
+
+    Unlike a messagebox, show() returns at once and the event loop keeps
+    running, so the timer and everything else carry on while a message is
+    up. Each message closes itself after timeout_ms or when its close
+    button is clicked; beyond max_visible the oldest is dropped.
+    """
+
+    def __init__(self, root, timeout_ms=8000, max_visible=3):
+        self.root = root
+        self.timeout_ms = timeout_ms
+        self.max_visible = max_visible
+        self.frame = ttk.Frame(root, padding=4)
+        # (frame, dismiss job) per message, oldest first
+        self.toasts = []
+
+    def show(self, title, message):
+        if len(self.toasts) >= self.max_visible:
+            self.dismiss(self.toasts[0][0])
+
+        toast = ttk.Frame(self.frame, relief="solid", borderwidth=1, padding=8)
+        ttk.Button(toast, text="✕", width=2, command=lambda: self.dismiss(toast)).pack(side=tk.RIGHT, anchor=tk.N)
+        ttk.Label(toast, text=title, font=("Helvetica", 10, "bold")).pack(anchor=tk.W)
+        ttk.Label(toast, text=message, justify=tk.LEFT).pack(anchor=tk.W)
+        toast.pack(fill=tk.X, pady=2)
+        self.toasts.append((toast, self.root.after(self.timeout_ms, self.dismiss, toast)))
+
+        # Floats over the bottom right corner without moving anything else
+        self.frame.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor="se")
+        self.frame.lift()
+
+    def dismiss(self, toast):
+        for i, (frame, job) in enumerate(self.toasts):
+            if frame is toast:
+                del self.toasts[i]
+                self.root.after_cancel(job)
+                frame.destroy()
+                break
+        if not self.toasts:
+            self.frame.place_forget()
+
+
+class MetricsPanel:
+    """A window listing the timings and counters of a Metrics registry.
+
+    Timings show how often each path ran and how long it took; counters
+    only their total. The list refreshes itself while the window is open,
+    updating rows in place, and can be saved as JSON or reset.
+    """
+
+    COLUMNS = ("Count", "Last", "Mean", "p95", "Max")
+
+    def __init__(self, parent, metrics, refresh_ms=1000):
+        self.metrics = metrics
+        self.refresh_ms = refresh_ms
+        self.refresh_job = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Diagnostics")
+        self.window.geometry("560x360")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        self.summary_label = ttk.Label(frame, text="")
+        self.summary_label.pack(fill=tk.X, pady=(0, 5))
+
+        self.tree = ttk.Treeview(frame, columns=self.COLUMNS, show="tree headings")
+        self.tree.heading("#0", text="Name")
+        self.tree.column("#0", width=180)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column if column == "Count" else f"{column} (ms)")
+            self.tree.column(column, width=70, anchor="e")
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.timings = self.tree.insert("", tk.END, text="Timings", open=True)
+        self.counters = self.tree.insert("", tk.END, text="Counters", open=True)
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(buttons, text="Close", command=self.close).pack(side=tk.RIGHT, padx=3)
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side=tk.RIGHT, padx=3)
+        ttk.Button(buttons, text="Save JSON...", command=self.save).pack(side=tk.RIGHT, padx=3)
+
+        self.refresh()
+
+    def is_open(self):
+        return self.refresh_job is not None
+
+    def refresh(self):
+        snapshot = self.metrics.snapshot()
+        self.summary_label.config(text=f"Since {snapshot['started'].replace('T', ' ')}")
+
+        def ms(value):
+            return "" if value is None else f"{value:.1f}"
+
+        rows = {}
+        for name, histogram in snapshot["histograms"].items():
+            rows[f"timing:{name}"] = (self.timings, name, (
+                histogram["count"], ms(histogram["last_ms"]), ms(histogram["mean_ms"]),
+                ms(histogram["p95_ms"]), ms(histogram["max_ms"])))
+        for name, count in snapshot["counters"].items():
+            rows[f"counter:{name}"] = (self.counters, name, (count, "", "", "", ""))
+
+        # Rows keep their item ids, so the selection and scroll position survive
+        for parent in (self.timings, self.counters):
+            for item_id in self.tree.get_children(parent):
+                if item_id not in rows:
+                    self.tree.delete(item_id)
+        for item_id, (parent, name, values) in rows.items():
+            if self.tree.exists(item_id):
+                self.tree.item(item_id, values=values)
+            else:
+                self.tree.insert(parent, tk.END, iid=item_id, text=name, values=values)
+
+        self.refresh_job = self.window.after(self.refresh_ms, self.refresh)
+
+    def reset(self):
+        self.metrics.reset()
+        self.window.after_cancel(self.refresh_job)
+        self.refresh()
+
+    def save(self):
+        from tkinter import filedialog, messagebox
+        filename = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile="pomodoro_metrics.json"
+        )
+        if not filename:
+            return
+        try:
+            self.metrics.dump(filename)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save metrics: {str(e)}", parent=self.window)
+
+    def close(self):
+        if self.refresh_job is not None:
+            self.window.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.window.destroy()
@@ -0,0 +1,62 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from pomodoro_core import DataLock, TaskTracker
+from pomodoro_core.cli import main as cli_main
+
+
+START = datetime(2024, 3, 4, 9, 0)
+
+
+def write_history(data_file):
+    tracker = TaskTracker(str(data_file), background=False)
+    tracker.load()
+    tracker.record_session("Work", "Email", START, START + timedelta(minutes=25))
+    tracker.close()
+
+
+def test_report_reads_while_the_data_file_is_locked(tmp_path, capsys):
+    data_file = tmp_path / "data.json"
+    write_history(data_file)
+    lock = DataLock(str(data_file))
+    lock.acquire()
+    try:
+        assert cli_main(["--data-file", str(data_file), "report", "--format", "json"]) == 0
+        assert json.loads(capsys.readouterr().out)["session_count"] == 1
+        # Commands that write still refuse
+        assert cli_main(["--data-file", str(data_file), "rename", "--project", "Work", "Job"]) == 1
+        assert "in use" in capsys.readouterr().err
+    finally:
+        lock.release()
+
+
+def test_writing_commands_give_the_lock_back(tmp_path, capsys):
+    data_file = tmp_path / "data.json"
+    write_history(data_file)
+    assert cli_main(["--data-file", str(data_file), "rename", "--project", "Work", "Job"]) == 0
+    assert cli_main(["--data-file", str(data_file), "rename", "--project", "Job", "--task", "Email", "Mail"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["Renamed project Work to Job", "Renamed Job: Email to Job: Mail"]
+
+
+def test_import_skips_rows_without_a_project_or_task(tmp_path, capsys):
+    export = tmp_path / "export.csv"
+    export.write_text("Date,Start Time,End Time,Project,Task,Duration (min)\n"
+                      "2024-03-04,09:00:00,09:25:00,Work,Email,25.0\n"
+                      "2024-03-04,10:00:00,10:25:00,,Email,25.0\n"
+                      "2024-03-04,11:00:00,11:25:00,Work, ,25.0\n")
+    data_file = tmp_path / "data.json"
+
+    assert cli_main(["--data-file", str(data_file), "import", str(export)]) == 0
+    output = capsys.readouterr()
+    assert output.out == "Imported 1 sessions, skipped 0 already present\n"
+    assert output.err == "Skipped 2 sessions without a project or task\n"
+
+
+def test_import_rejects_a_csv_that_is_not_an_export(tmp_path, capsys):
+    other = tmp_path / "other.csv"
+    other.write_text("Name,Minutes\nEmail,25\n")
+
+    assert cli_main(["--data-file", str(tmp_path / "data.json"), "import", str(other)]) == 1
+    assert "has no Date, Start Time, End Time, Project, Task column" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / "data.json.journal")
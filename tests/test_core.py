@@ -0,0 +1,204 @@
+import json
+from datetime import date, datetime, timedelta
+
+from pomodoro_core import Catalog, JournalStore, SessionRollups, SessionStore, TaskTracker, Typeahead
+from pomodoro_core.cli import main as cli_main
+from pomodoro_core.upgrade import V1Upgrade
+
+
+START = datetime(2024, 3, 4, 9, 0, 0, 250000)
+
+
+def record(tracker, project, task, start, minutes=25):
+    return tracker.record_session(project, task, start, start + timedelta(minutes=minutes))
+
+
+def open_tracker(data_file):
+    tracker = TaskTracker(str(data_file), background=False)
+    tracker.load()
+    return tracker
+
+
+def session_list(store):
+    """Return (start, project, task, duration) for every live row"""
+    sessions = store["sessions"]
+    return sorted((sessions.start_datetime(row), sessions.project_name(row), sessions.task_name(row),
+                   sessions.duration[row]) for row in sessions.rows())
+
+
+def test_journal_replays_changes_on_top_of_the_snapshot(tmp_path):
+    data_file = tmp_path / "data.json"
+    tracker = open_tracker(data_file)
+    record(tracker, "Work", "Email", START)
+    tracker.save()
+    record(tracker, "Work", "Review", START + timedelta(hours=1))
+    tracker.rename_project("Work", "Job")
+    tracker.delete_task(tracker.task_id("Job", "Email"))
+    tracker.close()
+
+    store = JournalStore(str(data_file))
+    data = store.load()
+    assert store.journal_entries == 4
+    assert data["catalog"].task_keys() == ["Job: Review"]
+    assert session_list(data) == [(START + timedelta(hours=1), "Job", "Review", 1500.0)]
+
+
+def test_torn_journal_line_is_left_to_the_writer(tmp_path):
+    data_file = tmp_path / "data.json"
+    tracker = open_tracker(data_file)
+    record(tracker, "Work", "Email", START)
+    tracker.close()
+    journal = tmp_path / "data.json.journal"
+    with open(journal, "ab") as file:
+        file.write(b'{"op": "add_project", "na')
+    torn_size = journal.stat().st_size
+
+    # Reading skips the torn line without touching the file
+    data = JournalStore(str(data_file)).load()
+    assert session_list(data) == [(START, "Work", "Email", 1500.0)]
+    assert journal.stat().st_size == torn_size
+
+    # The next append cuts it off, so the new entry can be read back
+    tracker = open_tracker(data_file)
+    tracker.add_project("Home")
+    tracker.close()
+    lines = journal.read_bytes().splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert JournalStore(str(data_file)).load()["catalog"].project_list() == ["Work", "Home"]
+
+
+def test_version_1_snapshot_is_converted_on_load(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({
+        "projects": ["Work", "Work: Ops"],
+        "tasks": ["Work: Email", "Work: Ops: Deploy"],
+        "sessions": [{
+            "start_time": START.isoformat(),
+            "end_time": (START + timedelta(minutes=25)).isoformat(),
+            "project": "Work: Ops",
+            "task": "Deploy",
+            "task_key": "Work: Ops: Deploy",
+            "duration_seconds": 1500.0
+        }]
+    }))
+
+    store = JournalStore(str(data_file))
+    data = store.load()
+    catalog = data["catalog"]
+    # A listed task belongs to the longest project name its key starts with
+    assert catalog.task_keys(catalog.project_id("Work")) == ["Work: Email"]
+    assert catalog.task_keys(catalog.project_id("Work: Ops")) == ["Work: Ops: Deploy"]
+    assert session_list(data) == [(START, "Work: Ops", "Deploy", 1500.0)]
+    assert store.needs_compaction()
+
+
+def test_version_1_delete_project_drops_tasks_filed_under_its_prefix():
+    catalog = Catalog()
+    sessions = SessionStore(catalog)
+    upgrade = V1Upgrade(catalog, sessions)
+    upgrade.read_header({"projects": ["Work", "Work: Ops", "Home"],
+                         "tasks": ["Work: Email", "Work: Ops: Deploy", "Home: Dishes"]})
+    upgrade.apply({"op": "add_session", "session": {
+        "start_time": START.isoformat(),
+        "end_time": (START + timedelta(minutes=25)).isoformat(),
+        "project": "Work: Ops",
+        "task": "Deploy",
+        "task_key": "Work: Ops: Deploy",
+        "duration_seconds": 1500.0
+    }})
+
+    upgrade.apply({"op": "delete_project", "project": "Work"})
+    assert catalog.task_keys() == ["Home: Dishes"]
+    assert len(sessions) == 0
+
+
+def test_rollups_follow_added_and_removed_rows():
+    catalog = Catalog()
+    work = catalog.add_project("Work")
+    email = catalog.add_task(work, "Email")
+    review = catalog.add_task(work, "Review")
+    store = SessionStore(catalog)
+
+    def add(task_id, start, minutes):
+        return store.add({"start_time": start.isoformat(),
+                          "end_time": (start + timedelta(minutes=minutes)).isoformat(),
+                          "task_id": task_id, "duration_seconds": minutes * 60.0})
+
+    first = add(email, START, 25)
+    rollups = SessionRollups(store)
+    assert rollups.totals() == (1500.0, 1)
+
+    next_day = START + timedelta(days=1)
+    second = add(review, next_day, 50)
+    rollups.add(second)
+    assert rollups.totals() == (4500.0, 2)
+    assert rollups.totals(next_day.date(), next_day.date()) == (3000.0, 1)
+    assert rollups.by_task_key() == {"Work: Email": (1500.0, 1), "Work: Review": (3000.0, 1)}
+
+    rollups.remove([first])
+    store.remove([first])
+    assert rollups.totals() == (3000.0, 1)
+    assert rollups.days_between(START.date(), START.date()) == []
+    # The running totals match a rebuild from the store
+    assert rollups.by_day() == SessionRollups(store).by_day()
+    assert rollups.by_project() == {"Work": (3000.0, 1)}
+
+
+def test_typeahead_ranks_name_prefix_then_word_prefix_then_fuzzy():
+    typeahead = Typeahead([(1, "Work: Email"), (2, "Home: email draft"), (3, "Emails: old"), (4, "Write code")])
+
+    assert typeahead.search("ema") == ["Emails: old", "Home: email draft", "Work: Email"]
+    assert typeahead.search("EMA", scores={1: 5.0}) == ["Emails: old", "Work: Email", "Home: email draft"]
+    assert typeahead.search("wkeml") == ["Work: Email"]
+    assert typeahead.search("w", allowed={1, 4}) == ["Work: Email", "Write code"]
+    assert typeahead.search("", scores={4: 1.0}) == ["Write code", "Emails: old", "Home: email draft", "Work: Email"]
+
+    typeahead.add(1, "Job: Email")
+    typeahead.discard(3)
+    assert typeahead.search("ema") == ["Home: email draft", "Job: Email"]
+    assert typeahead.search("wkeml") == []
+
+
+def test_cli_import_skips_sessions_already_recorded(tmp_path, capsys):
+    data_file = tmp_path / "data.json"
+    tracker = open_tracker(data_file)
+    record(tracker, "Work", "Email", START)
+    record(tracker, "Home", "Dishes", START + timedelta(hours=2))
+    tracker.close()
+
+    export = tmp_path / "export.csv"
+    assert cli_main(["--data-file", str(data_file), "sessions", "--range", "all", "--output", str(export)]) == 0
+    capsys.readouterr()
+
+    # The export only has whole seconds, but the sessions still match
+    assert cli_main(["--data-file", str(data_file), "import", str(export)]) == 0
+    assert "Imported 0 sessions, skipped 2" in capsys.readouterr().out
+
+    other_file = tmp_path / "other.json"
+    assert cli_main(["--data-file", str(other_file), "import", str(data_file)]) == 0
+    assert cli_main(["--data-file", str(other_file), "import", str(data_file)]) == 0
+    assert cli_main(["--data-file", str(other_file), "import", str(export)]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert output == ["Imported 2 sessions, skipped 0 already present",
+                      "Imported 0 sessions, skipped 2 already present",
+                      "Imported 0 sessions, skipped 2 already present"]
+
+    imported = open_tracker(other_file)
+    assert imported.count_sessions() == 2
+    assert imported.totals(date(2024, 3, 4), date(2024, 3, 4)) == (3000.0, 2)
+    imported.close()
+
+
+def test_typed_task_keys_do_not_become_task_names(tmp_path):
+    tracker = open_tracker(tmp_path / "data.json")
+    record(tracker, "Work", "Work: Fix bug", START)
+    record(tracker, "Work", "Work: Fix bug", START + timedelta(hours=1))
+    assert tracker.task_keys() == ["Work: Fix bug"]
+    assert tracker.task_id("Work", "Fix bug") is not None
+
+    # Picking a listed key adds nothing new
+    assert not tracker.add_task("Work", tracker.typed_task_name("Work: Fix bug", "Work"))
+    # Another project's prefix is part of the name
+    assert tracker.typed_task_name("Home: Dishes", "Work") == "Home: Dishes"
+    assert tracker.typed_task_name("Work: ", "Work") == "Work: "
+    tracker.close()
@@ -0,0 +1,58 @@
+import csv
+import io
+from datetime import date, datetime, timedelta
+
+from pomodoro_core import CSV_FIELDS, ExportJob, TaskTracker, write_csv
+from pomodoro_core.export import dump_csv
+
+
+START = datetime(2024, 3, 4, 9, 0, 0, 250000)
+
+
+def read_csv(filename):
+    with open(filename, newline='') as csvfile:
+        return list(csv.reader(csvfile))
+
+
+def test_sessions_are_exported_oldest_first_without_deleted_rows(tmp_path):
+    tracker = TaskTracker(str(tmp_path / "data.json"), background=False)
+    tracker.load()
+    tracker.record_session("Work", "Review", START + timedelta(days=1), START + timedelta(days=1, minutes=50))
+    tracker.record_session("Work", "Email", START, START + timedelta(minutes=25))
+    tracker.record_session("Home", "Dishes", START + timedelta(days=2), START + timedelta(days=2, minutes=10))
+    rows = tracker.iter_sessions(date(2024, 3, 4), date(2024, 3, 5))
+    # Deleting while an export is running skips the row instead of failing
+    tracker.delete_task(tracker.task_id("Work", "Review"))
+
+    filename = tmp_path / "export.csv"
+    assert write_csv(rows, str(filename)) == 1
+    assert read_csv(filename) == [CSV_FIELDS, ["2024-03-04", "09:00:00", "09:25:00", "Work", "Email", "25.0"]]
+    tracker.close()
+
+
+def test_progress_is_reported_every_so_many_rows():
+    rows = [(START, START + timedelta(seconds=90), "Work", "Email, \"quoted\"", 90.0)] * 5
+    csvfile = io.StringIO(newline='')
+    counts = []
+    assert dump_csv(iter(rows), csvfile, progress=counts.append, every=2) == 5
+    assert counts == [2, 4]
+    lines = csvfile.getvalue().splitlines()
+    assert lines[0] == "Date,Start Time,End Time,Project,Task,Duration (min)"
+    assert lines[1] == '2024-03-04,09:00:00,09:01:30,Work,"Email, ""quoted""",1.5'
+
+
+def test_export_job_reports_completion_and_errors(tmp_path):
+    rows = [(START, START + timedelta(minutes=25), "Work", "Email", 1500.0)] * 3
+    job = ExportJob(iter(rows), str(tmp_path / "export.csv"), total=4)
+    assert job.percent() == 0
+    job.start().thread.join()
+    assert job.done and job.error is None
+    assert job.written == 3 and job.percent() == 75
+    assert len(read_csv(tmp_path / "export.csv")) == 4
+
+    # Nothing to export counts as finished
+    assert ExportJob([], str(tmp_path / "empty.csv"), total=0).percent() == 100
+
+    job = ExportJob(iter(rows), str(tmp_path / "missing" / "export.csv"), total=3)
+    job.start().thread.join()
+    assert job.done and isinstance(job.error, OSError)
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta
+
+from pomodoro_core import Catalog, SessionIndex, SessionStore
+
+
+START = datetime(2024, 3, 4, 9, 0, 0, 250000)
+
+
+def make_store():
+    catalog = Catalog()
+    task_id = catalog.add_task(catalog.add_project("Work"), "Email")
+    store = SessionStore(catalog)
+
+    def add(start):
+        return store.add({"start_time": start.isoformat(),
+                          "end_time": (start + timedelta(minutes=25)).isoformat(),
+                          "task_id": task_id, "duration_seconds": 1500.0})
+    return store, add
+
+
+def test_rows_are_kept_in_start_order_within_each_day():
+    store, add = make_store()
+    late = add(START + timedelta(hours=8))
+    early = add(START)
+    index = SessionIndex(store)
+
+    # Rows added later land at their start time, not at the end of the day
+    middle = add(START + timedelta(hours=2))
+    index.add(middle)
+    # Just before midnight is still the same day
+    night = add(datetime(2024, 3, 4, 23, 59, 59, 999999))
+    index.add(night)
+    next_day = add(datetime(2024, 3, 5))
+    index.add(next_day)
+
+    assert index.between() == [early, middle, late, night, next_day]
+    assert index.between(newest_first=True) == [next_day, night, late, middle, early]
+    assert index.between(date(2024, 3, 4), date(2024, 3, 4)) == [early, middle, late, night]
+    assert list(index.iter_between(date(2024, 3, 5))) == [next_day]
+    assert index.day_keys == [19786, 19787]
+    assert len(index) == 5
+
+
+def test_ranges_only_visit_days_that_have_sessions():
+    store, add = make_store()
+    rows = [add(START + timedelta(days=offset)) for offset in (0, 2, 5)]
+    index = SessionIndex(store)
+
+    assert index.days_between(date(2024, 3, 5), date(2024, 3, 8)) == [19788]
+    assert index.days_between(end_date=date(2024, 3, 6)) == [19786, 19788]
+    assert index.days_between(date(2024, 3, 10)) == []
+    assert index.count_between(date(2024, 3, 4), date(2024, 3, 9)) == 3
+    assert index.between(date(2024, 3, 5), None, newest_first=True) == [rows[2], rows[1]]
+
+
+def test_removing_rows_drops_days_left_empty():
+    store, add = make_store()
+    first = add(START)
+    second = add(START + timedelta(hours=1))
+    other_day = add(START + timedelta(days=1))
+    index = SessionIndex(store)
+
+    index.remove([first, other_day])
+    assert index.between() == [second]
+    assert index.day_keys == [19786]
+    assert index.count_between() == 1
+
+    # Removing a row twice is harmless
+    index.remove([other_day])
+    assert len(index) == 1
@@ -0,0 +1,89 @@
+import threading
+
+from pomodoro_core import PersistenceWorker
+
+
+class FakeStore:
+    """Record what the worker writes, in order"""
+
+    def __init__(self, compact_every=3, fail_compact=False):
+        self.compact_every = compact_every
+        self.journal_entries = 1
+        self.fail_compact = fail_compact
+        self.writes = []
+        self.deletions = []
+        self.written = threading.Event()
+
+    def append_many(self, changes):
+        self.writes.append(("journal", changes))
+        self.written.set()
+
+    def compact(self, data):
+        if self.fail_compact:
+            raise OSError("disk full")
+        self.writes.append(("snapshot", data))
+
+    def note_deletion(self, op, payload):
+        self.deletions.append((op, payload))
+
+
+def snapshot(projects):
+    return {"projects": projects, "tasks": [], "sessions": []}
+
+
+def test_a_burst_of_changes_is_written_as_one_batch():
+    store = FakeStore()
+    worker = PersistenceWorker(store, debounce=60)
+    try:
+        for name in ("Work", "Home", "Garden"):
+            worker.submit("add_project", name=name)
+        # Nothing reaches the disk inside the debounce window
+        assert not store.written.wait(0.05)
+        worker.flush()
+        assert store.writes == [("journal", [("add_project", {"name": "Work"}),
+                                             ("add_project", {"name": "Home"}),
+                                             ("add_project", {"name": "Garden"})])]
+    finally:
+        worker.close()
+
+
+def test_the_debounce_window_ends_without_a_flush():
+    store = FakeStore()
+    worker = PersistenceWorker(store, debounce=0.01)
+    try:
+        worker.submit("add_project", name="Work")
+        assert store.written.wait(5)
+    finally:
+        worker.close()
+    assert store.writes == [("journal", [("add_project", {"name": "Work"})])]
+
+
+def test_a_snapshot_replaces_the_changes_queued_before_it():
+    store = FakeStore()
+    worker = PersistenceWorker(store, debounce=60)
+    assert not worker.needs_compaction()
+    worker.submit("add_project", name="Work")
+    worker.submit("delete_sessions", ids=[4])
+    assert worker.needs_compaction()
+
+    worker.compact(snapshot(["Work"]))
+    assert worker.changes_since_snapshot == 0
+    worker.submit("add_project", name="Home")
+    # Closing flushes what is still queued
+    worker.close()
+
+    assert store.writes == [("snapshot", snapshot(["Work"])),
+                            ("journal", [("add_project", {"name": "Home"})])]
+    assert store.deletions == [("add_project", {"name": "Work"}), ("delete_sessions", {"ids": [4]})]
+    assert not worker.thread.is_alive()
+
+
+def test_changes_stay_in_the_journal_when_the_snapshot_fails():
+    store = FakeStore(fail_compact=True)
+    worker = PersistenceWorker(store, debounce=60)
+    worker.submit("add_project", name="Work")
+    worker.compact(snapshot(["Work"]))
+    worker.submit("add_project", name="Home")
+    worker.close()
+
+    assert store.writes == [("journal", [("add_project", {"name": "Work"}), ("add_project", {"name": "Home"})])]
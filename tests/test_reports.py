@@ -0,0 +1,103 @@
+import csv
+import json
+from datetime import date, datetime, timedelta
+
+from pomodoro_core import Catalog, SessionRollups, SessionStore, build_summary, write_summary
+from pomodoro_core.reports import longest_streak
+
+
+START = datetime(2024, 3, 4, 9, 0, 0, 250000)
+
+
+def make_rollups(sessions):
+    """Return rollups over (project, task, start, minutes) sessions"""
+    catalog = Catalog()
+    store = SessionStore(catalog)
+    for project, task, start, minutes in sessions:
+        project_id = catalog.project_id(project)
+        if project_id is None:
+            project_id = catalog.add_project(project)
+        task_id = catalog.task_id(project_id, task)
+        if task_id is None:
+            task_id = catalog.add_task(project_id, task)
+        store.add({"start_time": start.isoformat(),
+                   "end_time": (start + timedelta(minutes=minutes)).isoformat(),
+                   "task_id": task_id, "duration_seconds": minutes * 60.0})
+    return SessionRollups(store)
+
+
+def test_summary_streak_counts_whole_days():
+    rollups = make_rollups([("Work", "Email", START + timedelta(days=offset), 25) for offset in range(3)])
+
+    streak = build_summary(rollups)["longest_streak"]
+    assert streak == {"start_date": "2024-03-04", "end_date": "2024-03-06", "days": 3,
+                      "sessions": 3, "seconds": 4500.0}
+    assert type(streak["days"]) is int
+    assert [day for day, _, _ in rollups.by_day()] == [19786, 19787, 19788]
+    assert build_summary(rollups, date(2024, 3, 5), date(2024, 3, 5))["longest_streak"]["days"] == 1
+
+
+def test_longest_streak_prefers_the_longest_then_the_earliest_run():
+    assert longest_streak([]) is None
+    assert longest_streak([(10, 60.0, 1)]) == (10, 10, 1, 60.0)
+    # A gap of a day ends the run
+    days = [(10, 60.0, 1), (11, 120.0, 2), (13, 60.0, 1), (14, 60.0, 1), (15, 60.0, 1), (17, 600.0, 5)]
+    assert longest_streak(days) == (13, 15, 3, 180.0)
+    # Equally long runs keep the first
+    assert longest_streak([(1, 60.0, 1), (2, 60.0, 1), (5, 300.0, 3), (6, 300.0, 3)]) == (1, 2, 2, 120.0)
+
+
+def test_summary_of_an_empty_range():
+    summary = build_summary(make_rollups([("Work", "Email", START, 25)]), date(2024, 4, 1), date(2024, 4, 30))
+    assert summary["session_count"] == 0
+    assert summary["average_session_seconds"] == 0.0
+    assert summary["longest_streak"] is None
+    assert summary["days"] == [] and summary["projects"] == []
+
+
+def summary_with_breakdowns():
+    return build_summary(make_rollups([
+        ("Work", "Email", START, 25),
+        ("Work", "Review", START + timedelta(hours=1), 50),
+        ("Home", "Dishes", START + timedelta(days=1), 10),
+        ("Work", "Email", START + timedelta(days=3), 25),
+    ]))
+
+
+def test_summary_json_output(tmp_path):
+    filename = tmp_path / "summary.json"
+    write_summary(summary_with_breakdowns(), str(filename))
+
+    summary = json.loads(filename.read_text())
+    assert summary["session_count"] == 4
+    assert summary["total_seconds"] == 6600.0
+    assert summary["average_session_seconds"] == 1650.0
+    assert summary["active_days"] == 3
+    assert summary["longest_streak"] == {"start_date": "2024-03-04", "end_date": "2024-03-05", "days": 2,
+                                         "sessions": 3, "seconds": 5100.0}
+    assert summary["projects"] == [{"project": "Work", "seconds": 6000.0, "sessions": 3},
+                                   {"project": "Home", "seconds": 600.0, "sessions": 1}]
+    assert [task["task_key"] for task in summary["tasks"]] == ["Work: Email", "Work: Review", "Home: Dishes"]
+    assert [day["date"] for day in summary["days"]] == ["2024-03-04", "2024-03-05", "2024-03-07"]
+
+
+def test_summary_csv_output(tmp_path):
+    filename = tmp_path / "summary.csv"
+    write_summary(summary_with_breakdowns(), str(filename))
+
+    with open(filename, newline='') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert rows == [
+        ["Section", "Name", "Sessions", "Duration (min)"],
+        ["Total", "", "4", "110.0"],
+        ["Average Session", "", "", "27.5"],
+        ["Longest Streak", "2 days (2024-03-04 to 2024-03-05)", "3", "85.0"],
+        ["Project", "Work", "3", "100.0"],
+        ["Project", "Home", "1", "10.0"],
+        ["Task", "Work: Email", "2", "50.0"],
+        ["Task", "Work: Review", "1", "50.0"],
+        ["Task", "Home: Dishes", "1", "10.0"],
+        ["Day", "2024-03-04", "2", "75.0"],
+        ["Day", "2024-03-05", "1", "10.0"],
+        ["Day", "2024-03-07", "1", "25.0"],
+    ]
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from pomodoro_core import SnapshotReader, write_snapshot
+
+
+HEADER = {"version": 2, "journal_seq": 1234567, "next_project_id": 3, "next_task_id": 10,
+          "projects": [{"id": 1, "name": "Work"}, {"id": 2, "name": "Café \"Estée\" \\ \U0001F345"}],
+          "tasks": [{"id": 9, "project_id": 2, "name": "Tab\there,\nnewline"}]}
+SESSIONS = [{"start_time": "2024-03-04T09:00:00.250000", "end_time": "2024-03-04T09:25:00.250000",
+             "task_id": task_id, "duration_seconds": duration}
+            for task_id, duration in ((9, 1500.0), (123456789, 1499.999999), (9, 12345678901234.5))]
+
+
+def read_all(text, chunk_size):
+    reader = SnapshotReader(io.StringIO(text), chunk_size)
+    assert reader.header()
+    sessions = list(reader.sessions())
+    return reader.values, sessions
+
+
+def test_values_split_across_chunk_boundaries_decode_whole():
+    file = io.StringIO()
+    write_snapshot(file, HEADER, SESSIONS)
+    text = file.getvalue()
+
+    # Every chunk size puts the boundaries inside different numbers, strings and escapes
+    for chunk_size in range(1, len(text) + 2):
+        values, sessions = read_all(text, chunk_size)
+        assert values == HEADER, chunk_size
+        assert sessions == SESSIONS, chunk_size
+
+
+def test_values_after_the_sessions_are_decoded_too():
+    # Early snapshots wrote "tasks" after the sessions
+    text = json.dumps({"projects": ["Work"], "sessions": SESSIONS[:1], "tasks": ["Work: Émail"]}, indent=4)
+    for chunk_size in (1, 7, 64, 1 << 16):
+        values, sessions = read_all(text, chunk_size)
+        assert values == {"projects": ["Work"], "tasks": ["Work: Émail"]}
+        assert sessions == SESSIONS[:1]
+
+
+def test_files_that_are_not_snapshots():
+    assert not SnapshotReader(io.StringIO("[1, 2]")).header()
+    assert not SnapshotReader(io.StringIO("")).header()
+
+    reader = SnapshotReader(io.StringIO('{"projects": [], "sessions": [{"task_id": 1}, {"task_'), 8)
+    assert reader.header()
+    with pytest.raises(json.JSONDecodeError):
+        list(reader.sessions())
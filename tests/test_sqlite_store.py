@@ -0,0 +1,91 @@
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from pomodoro_core import SQLiteStore, TaskTracker, migrate_json_to_sqlite
+
+
+START = datetime(2024, 3, 4, 9, 0, 0, 250000)
+
+
+def open_tracker(data_file):
+    tracker = TaskTracker(str(data_file), background=False)
+    tracker.load()
+    return tracker
+
+
+def record(tracker, project, task, start, minutes=25):
+    return tracker.record_session(project, task, start, start + timedelta(minutes=minutes))
+
+
+def test_migration_copies_the_history_and_keeps_deleted_ids_retired(tmp_path):
+    json_file = tmp_path / "data.json"
+    tracker = open_tracker(json_file)
+    record(tracker, "Work", "Email", START)
+    record(tracker, "Work", "Review", START + timedelta(days=1))
+    tracker.add_task("Home", "Dishes")
+    tracker.delete_project("Home")
+    tracker.close()
+
+    db_file = tmp_path / "data.db"
+    assert migrate_json_to_sqlite(str(json_file), str(db_file)) == 2
+    with pytest.raises(FileExistsError):
+        migrate_json_to_sqlite(str(json_file), str(db_file))
+
+    # The data file name now opens the database next to it
+    tracker = open_tracker(json_file)
+    assert isinstance(tracker.store, SQLiteStore)
+    assert tracker.task_keys() == ["Work: Email", "Work: Review"]
+    assert tracker.sessions.start_datetime(tracker.rows_between(START.date(), START.date())[0]) == START
+
+    tracker.add_task("Garden", "Weeds")
+    assert tracker.catalog.project_id("Garden") == 3
+    assert tracker.task_id("Garden", "Weeds") == 4
+    tracker.close()
+
+
+def test_changes_are_committed_and_streamed_back_by_date(tmp_path):
+    tracker = open_tracker(tmp_path / "data.json")
+    tracker.close()
+    migrate_json_to_sqlite(str(tmp_path / "data.json"), str(tmp_path / "data.db"))
+
+    tracker = open_tracker(tmp_path / "data.json")
+    record(tracker, "Work", "Email", START)
+    record(tracker, "Work", "Email", START + timedelta(days=2), minutes=50)
+    tracker.rename_project("Work", "Job")
+    tracker.close()
+
+    store = SQLiteStore(str(tmp_path / "data.db"))
+    sessions = list(store.iter_sessions(date(2024, 3, 5), None))
+    assert sessions == [(START + timedelta(days=2), START + timedelta(days=2, minutes=50), "Job", "Email", 3000.0)]
+    assert len(store.load(since=date(2024, 3, 5))["sessions"]) == 1
+    assert len(store.load()["sessions"]) == 2
+    store.close()
+
+
+def test_version_1_database_is_upgraded_when_opened(tmp_path):
+    db_file = tmp_path / "data.db"
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY, task_key TEXT NOT NULL UNIQUE);
+        CREATE TABLE sessions (id INTEGER PRIMARY KEY, start_time TEXT NOT NULL, end_time TEXT NOT NULL,
+                               project TEXT NOT NULL, task TEXT NOT NULL, task_key TEXT NOT NULL,
+                               duration_seconds REAL NOT NULL);
+        INSERT INTO projects (name) VALUES ('Work'), ('Work: Ops');
+        INSERT INTO tasks (task_key) VALUES ('Work: Email'), ('Work: Ops: Deploy');
+    """)
+    conn.execute("INSERT INTO sessions (start_time, end_time, project, task, task_key, duration_seconds) "
+                 "VALUES (?, ?, 'Work: Ops', 'Deploy', 'Work: Ops: Deploy', 1500.0)",
+                 (START.isoformat(), (START + timedelta(minutes=25)).isoformat()))
+    conn.commit()
+    conn.close()
+
+    store = SQLiteStore(str(db_file))
+    data = store.load()
+    catalog = data["catalog"]
+    assert catalog.task_keys(catalog.project_id("Work: Ops")) == ["Work: Ops: Deploy"]
+    assert data["sessions"].task_key_name(0) == "Work: Ops: Deploy"
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    store.close()
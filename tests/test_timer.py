@@ -0,0 +1,76 @@
+from pomodoro_core import LONG_BREAK, POMODORO, SHORT_BREAK, PomodoroCycle, TimerEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_engine_counts_down_against_its_deadline():
+    clock = FakeClock()
+    engine = TimerEngine(10, clock)
+    assert engine.remaining() == 10 and not engine.running
+
+    engine.start()
+    clock.now += 2.25
+    assert engine.remaining() == 8
+    assert engine.ms_until_next_second() == 750
+
+    # Time passes while paused without being counted
+    engine.pause()
+    clock.now += 60
+    assert engine.remaining() == 8
+    engine.start()
+    clock.now += 7.5
+    assert not engine.expired()
+    assert engine.remaining() == 1
+    clock.now += 0.25
+    assert engine.remaining() == 0
+    assert engine.expired()
+    # Only reported once
+    assert not engine.expired()
+
+
+def test_late_wakeups_do_not_drift():
+    clock = FakeClock()
+    engine = TimerEngine(25 * 60, clock)
+    engine.start()
+    # However irregular the wakeups, the remaining time follows the clock
+    for late in (1.4, 0.9, 3.0, 0.1, 12.6):
+        clock.now += late
+        engine.remaining()
+    assert engine.remaining() == 25 * 60 - 18
+    assert engine.ms_until_next_second() == 1000
+
+
+def test_cycle_takes_a_long_break_after_every_fourth_pomodoro():
+    clock = FakeClock()
+    cycle = PomodoroCycle(pomodoro_time=60, short_break_time=10, long_break_time=30, clock=clock)
+    modes = []
+    for _ in range(8):
+        assert cycle.advance() == POMODORO
+        modes.append(cycle.mode)
+        cycle.advance()
+    assert modes == [SHORT_BREAK, SHORT_BREAK, SHORT_BREAK, LONG_BREAK] * 2
+    assert cycle.completed_pomodoros == 8
+    assert cycle.mode == POMODORO and cycle.remaining() == 60
+
+
+def test_cycle_progress_and_skipping_a_break():
+    clock = FakeClock()
+    cycle = PomodoroCycle(pomodoro_time=60, short_break_time=10, clock=clock)
+    assert not cycle.skip_break()
+
+    cycle.start()
+    clock.now += 15
+    assert cycle.progress() == 0.25
+    clock.now += 60
+    assert cycle.expired() and cycle.progress() == 1.0
+
+    assert cycle.advance() == POMODORO
+    assert cycle.on_break and not cycle.running and cycle.remaining() == 10
+    assert cycle.skip_break()
+    assert cycle.mode == POMODORO and cycle.progress() == 0.0 and cycle.completed_pomodoros == 1